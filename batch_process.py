@@ -0,0 +1,81 @@
+"""
+Traitement en ligne de commande de fichiers Trade (Excel ou CSV), avec la
+même extraction que l'application Streamlit.
+
+Exemples :
+    python batch_process.py "dumps/*.xlsx" --format csv --output-dir processed
+    python batch_process.py dumps/ --format parquet --workers 4
+    python batch_process.py trade.xlsx --store results.sqlite
+    python batch_process.py "dumps/*.xlsx" --cert-index certificates.sqlite
+"""
+
+import argparse
+import sys
+import time
+
+from utils.batch import expand_inputs, process_files, throughput_summary
+from utils.excel_io import DEFAULT_BATCH_SIZE, EXPORT_FORMATS
+
+
+def print_result(summary):
+    if summary['error']:
+        print(f"FAILED  {summary['input']}: {summary['error']}", flush=True)
+    else:
+        rate = summary['rows'] / summary['seconds'] if summary['seconds'] > 0 else 0.0
+        print(f"OK      {summary['input']} -> {summary['output']} "
+              f"({summary['rows']} rows, {summary['seconds']:.2f} s, {rate:.0f} rows/s)", flush=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Process trade files without the Streamlit interface.")
+    parser.add_argument('inputs', nargs='+', help="input files, folders or glob patterns")
+    parser.add_argument('--format', choices=list(EXPORT_FORMATS), default='xlsx',
+                        help="output format (default: xlsx)")
+    parser.add_argument('--output-dir', default='processed', help="output folder (default: processed)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="number of files processed in parallel (default: number of CPU cores)")
+    parser.add_argument('--sheet', default=None, help="sheet to read in Excel files (default: active sheet)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help="rows per streamed batch when reading Excel files")
+    parser.add_argument('--store', default=None,
+                        help="SQLite file of per-row results: rows already processed are reused "
+                             "and only new or changed rows are extracted (the least recently used "
+                             "rows are removed beyond VDG_RESULT_STORE_MAX_ROWS, default 500000)")
+    parser.add_argument('--compact', action='store_true',
+                        help="write the compact schema: categories, float32 dimensions and "
+                             "empty cells instead of N/A")
+    parser.add_argument('--cert-index', default=None,
+                        help="SQLite certificate index updated with the certificates of each output file "
+                             "(query it with certificate_index.py)")
+    args = parser.parse_args(argv)
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("No input files found.", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    try:
+        summaries = process_files(
+            paths,
+            args.output_dir,
+            export_format=args.format,
+            workers=args.workers,
+            sheet_name=args.sheet,
+            batch_size=args.batch_size,
+            store_path=args.store,
+            compact=args.compact,
+            index_path=args.cert_index,
+            on_result=print_result,
+        )
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    totals = throughput_summary(summaries, time.perf_counter() - start)
+
+    print(f"\n{totals['files'] - totals['failed']}/{totals['files']} files processed, "
+          f"{totals['rows']} rows in {totals['seconds']:.2f} s "
+          f"({totals['rows_per_second']:.0f} rows/s)")
+    return 1 if totals['failed'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""
+Benchmarks et corpus de référence des extracteurs.
+
+    python -m benchmarks.run       # débit et mémoire par extracteur et par moteur
+    python -m benchmarks.golden    # sorties identiques aux extracteurs d'origine
+"""
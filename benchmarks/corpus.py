@@ -0,0 +1,167 @@
+# benchmarks/corpus.py
+"""
+Génération de descriptions Trade synthétiques pour les benchmarks et le
+corpus de référence.
+
+Chaque description combine des fragments réalistes (préfixe, forme, couleur)
+avec un format de dimensions, de PCS/Carat et de clarté tirés des listes
+ci-dessous, qui couvrent toutes les branches d'extract_dimensions (17 formats),
+d'extract_pcs_carat et d'extracting_clarity. La génération est déterministe
+pour une graine donnée.
+"""
+
+import random
+
+import pandas as pd
+
+# Les 17 formats d'extract_dimensions, dans l'ordre de la cascade.
+# Les formats 14 à 16 sont captés par des étapes précédentes (11 et 13) :
+# ils restent dans le corpus pour figer ce comportement.
+DIMENSION_FORMATS = [
+    ('paren_dash', '({a} - {b} * {c})'),
+    ('star', '({a}*{b}*{c})'),
+    ('d_h', 'D ({a}-{b}) H({c}-{d})'),
+    ('l_h', 'L({a}-{b})H({c}-{d})'),
+    ('l_w_h', 'L( {a}-{b}) W( {c}-{d}) H( {e}-{f})'),
+    ('dia_mm', 'DIA MM {a} - {b} HEIGHT MM {c}-{d}'),
+    ('nc_slash', '/NON CERT /NC/{a} /{b} /{c}'),
+    ('slash', '{a}/{b}/{c}'),
+    ('x', '{a}X{b}X{c}'),
+    ('mm_range', '{a}MM - {b}MM'),
+    ('single_mm', '{a}MM'),
+    ('paren_range', '({a}-{b})'),
+    ('simple_range', '{a}-{b}'),
+    ('size', 'SIZE:{a}-{b}MM'),
+    ('mm_size', 'MM SIZE: {a}-{b}'),
+    ('mm_to', '{a}MM TO {b}MM'),
+    ('numbers', '{a} {b} {c}'),
+    ('two_numbers', '{a} {b}'),
+    ('dia_only', 'DIA MM {a}-{b}'),
+    ('none', ''),
+]
+
+# Formats PCS/Carat : une entrée par branche de la cascade
+PCS_FORMATS = [
+    ('pieces_count', 'PCS-{i}'),
+    ('pieces_count_slash', '/PCS-{i}'),
+    ('pc_end', 'PC{i}'),
+    ('pc_end_gia', 'GIA {g} PC {i}'),
+    ('pc_anywhere', 'PC {i} WHITE'),
+    ('pc_anywhere_after_gia', 'GIA {g} PC {i} WHITE ROUND STONES'),
+    ('pc_anywhere_gia', 'PC {g} GIA {g}'),
+    ('pcs_cts', 'PCS/CTS {i}'),
+    ('pcs_cts_glued', 'PCS/CTS{i}'),
+    ('fraction', 'PCT/CT {i}/1'),
+    ('p_cts', 'P/CTS{i}'),
+    ('pc_cts', 'PC/CTS {i}'),
+    ('p_ct', 'P/CT {i}'),
+    ('pc_ct', 'PC/CT{i}'),
+    ('pcs_ct', 'PCS/CT {i}'),
+    ('p_c', 'P/C {i}'),
+    ('space_before', '{i} P/CTS'),
+    ('alt_dash', 'P/CTS-{i}'),
+    ('alt_equal', 'PCS/CT={i}'),
+    ('alt_colon', 'PC/CTS:{i}'),
+    ('standalone', '{i} PCS'),
+    ('standalone_per_carat', '{i} PCS PER CARAT'),
+    ('standalone_gia', 'GIA {g} {g} PCS'),
+    ('explicit_pieces', '{i} PIECES PER CARAT'),
+    ('explicit_pcs', '{i} PCS/CTS'),
+    ('explicit_p', '{i} P PER CT'),
+    ('near_terms', 'PC PER CARAT ~{i}'),
+    ('near_terms_empty', 'PC/CARAT'),
+    ('none', ''),
+]
+
+# Formats de clarté : une entrée par étape de la cascade
+CLARITY_FORMATS = [
+    ('exact', '{code}'),
+    ('glued_number', '{code}{n}'),
+    ('spaced', '{spaced}'),
+    ('dashed', '{dashed}'),
+    ('slash', '{code}/'),
+    ('parenthesis', '({code})'),
+    ('flawless', 'FLAWLESS'),
+    ('internally_flawless', 'INTERNALLY FLAWLESS'),
+    ('generic', '{generic}'),
+    ('indicator', 'CLARITY: {fuzzy}'),
+    ('indicator_short', 'CL={fuzzy}'),
+    ('color_sequence', '{color}/{fuzzy}'),
+    ('substring', 'XX{generic}1Y'),
+    ('none', ''),
+]
+
+PREFIXES = ['CPD', 'CPD D/C', 'CUT & POLISHED DIAMOND', 'POLISHED DIAMONDS', 'D/CUT', '']
+SHAPES = ['ROUND', 'RD', 'RBC', 'PRINCESS', 'PR', 'EMERALD', 'EM', 'CUSHION', 'OVAL', 'OV',
+          'PEAR', 'PS', 'HEART', 'MARQUISE', 'MQ', 'RADIANT', 'ASSCHER', 'BAGUETTE',
+          'RECTANGULAR MODIFIED BRILLIANT', 'FANCY', '']
+COLORS = ['WHITE', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M', '']
+CERTIFICATES = ['GIA {g}', 'GIA:{g}', 'GIA-{g}', 'GIA{g}', 'GIA NUMBER {g}', '(PL)', 'NON CERT', '']
+CLARITY_CODES = ['FL', 'IF', 'VVS1', 'VVS2', 'VS1', 'VS2', 'SI1', 'SI2', 'I1', 'I2', 'I3']
+SEPARATORS = [', ', ' ', ' / ', '/']
+
+
+def _decimal(rng):
+    return rng.choice(['{:.2f}', '{:.1f}', '{:.3f}']).format(rng.uniform(0.5, 12))
+
+def _fill(template, rng):
+    code = rng.choice(CLARITY_CODES)
+    numbered = rng.choice(['VVS1', 'VVS2', 'VS1', 'VS2', 'SI1', 'SI2', 'I1', 'I2', 'I3'])
+    return template.format(
+        a=_decimal(rng), b=_decimal(rng), c=_decimal(rng),
+        d=_decimal(rng), e=_decimal(rng), f=_decimal(rng),
+        i=rng.choice(['6', '20', '1.5', '40', str(rng.randint(1, 300))]),
+        g=rng.choice(['1234567890', '2141438593', '12345', str(rng.randint(10**5, 10**10))]),
+        n=rng.randint(0, 999),
+        code=code,
+        spaced=numbered[:-1] + ' ' + numbered[-1],
+        dashed=numbered[:-1] + rng.choice('-.') + numbered[-1],
+        generic=rng.choice(['VVS', 'VS', 'SI']),
+        fuzzy=rng.choice(['VS1', 'SI', 'VVS', 'I', 'S1', 'X', 'IF1', 'FL', 'VS-2', 'SI 1']),
+        color=rng.choice('DEFGHIJKLMZ'),
+    )
+
+def generate_description(rng):
+    """
+    Une description synthétique : préfixe, forme, couleur, clarté,
+    dimensions, PCS/Carat et certificat, dans un ordre et avec des
+    séparateurs variables.
+    """
+    parts = [
+        rng.choice(PREFIXES),
+        rng.choice(SHAPES),
+        rng.choice(COLORS),
+        _fill(rng.choice(CLARITY_FORMATS)[1], rng),
+        _fill(rng.choice(DIMENSION_FORMATS)[1], rng),
+        _fill(rng.choice(PCS_FORMATS)[1], rng),
+        _fill(rng.choice(CERTIFICATES), rng),
+    ]
+    head, tail = parts[:2], parts[2:]
+    rng.shuffle(tail)
+    parts = [part for part in head + tail if part]
+    text = rng.choice(SEPARATORS).join(parts)
+    return text.lower() if rng.random() < 0.05 else text
+
+def generate_descriptions(n, seed=0, distinct=None):
+    """
+    Retourne `n` descriptions synthétiques. Avec `distinct`, les lignes sont
+    tirées dans un ensemble de `distinct` descriptions différentes, pour
+    reproduire les répétitions des vrais fichiers.
+    """
+    rng = random.Random(seed)
+    if distinct is None:
+        return [generate_description(rng) for _ in range(n)]
+    pool = [generate_description(rng) for _ in range(distinct)]
+    return [rng.choice(pool) for _ in range(n)]
+
+def generate_frame(n, seed=0, distinct=None):
+    """
+    DataFrame d'entrée minimal (description et Quantity) pour le pipeline.
+    Quelques cellules non textuelles (vides, nombres) sont incluses.
+    """
+    rng = random.Random(seed + 1)
+    descriptions = generate_descriptions(n, seed=seed, distinct=distinct)
+    for row in range(0, n, 997):
+        descriptions[row] = rng.choice([None, 12.5, ''])
+    quantities = [rng.choice([1.5, 0.25, 3, 0, None, '2']) for _ in range(n)]
+    return pd.DataFrame({'Description of the goods': descriptions, 'Quantity': quantities})
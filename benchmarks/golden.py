@@ -0,0 +1,156 @@
+# benchmarks/golden.py
+"""
+Corpus de référence (golden) des extracteurs.
+
+Le fichier golden/golden_corpus.jsonl contient des lignes d'entrée
+synthétiques et les colonnes produites par les extracteurs d'origine
+(benchmarks.baseline, copiés de la version de départ), indépendants des
+moteurs actuels. La vérification relance chaque moteur d'EXTRACTION_MODES
+sur ces entrées et exige des colonnes identiques octet pour octet : même
+dtype et même repr() de chaque valeur. Les colonnes ajoutées depuis (bornes
+numériques des dimensions) ne figurent pas dans le corpus.
+
+    python -m benchmarks.golden            # vérifie tous les moteurs
+    python -m benchmarks.golden --update   # régénère le fichier
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.baseline import BASELINE_COLUMNS, classify_baseline
+from benchmarks.corpus import generate_frame
+from utils import vectorized
+from utils.data_processing import DESCRIPTION_COLUMN, EXTRACTION_MODES, classify_frame
+
+GOLDEN_PATH = Path(__file__).parent / 'golden' / 'golden_corpus.jsonl'
+GOLDEN_ROWS = 1000
+GOLDEN_SEED = 2024
+INPUT_COLUMNS = [DESCRIPTION_COLUMN, 'Quantity']
+
+
+def encode_value(value):
+    """Représentation exacte d'une cellule (type compris) : repr() de la valeur Python."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    return repr(value)
+
+def encode_frame(df, columns=BASELINE_COLUMNS):
+    """
+    Colonnes `columns` de `df`, encodées : {colonne: (dtype, [valeurs encodées])}.
+    Les colonnes absentes de `df` sont omises.
+    """
+    return {
+        column: (str(df[column].dtype), [encode_value(value) for value in df[column].tolist()])
+        for column in columns if column in df.columns
+    }
+
+def column_digest(values):
+    """Empreinte SHA-256 d'une colonne encodée."""
+    return hashlib.sha256('\n'.join(values).encode('utf-8')).hexdigest()
+
+def write_golden(path=GOLDEN_PATH, rows=GOLDEN_ROWS, seed=GOLDEN_SEED):
+    """
+    Génère le corpus, le classe avec les extracteurs d'origine et écrit le
+    fichier golden : une ligne d'en-tête (dtypes, empreintes) puis une
+    ligne JSON par entrée.
+    """
+    frame = generate_frame(rows, seed=seed)
+    expected = encode_frame(classify_baseline(frame))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        header = {
+            'dtypes': {column: dtype for column, (dtype, _) in expected.items()},
+            'digests': {column: column_digest(values) for column, (_, values) in expected.items()},
+        }
+        f.write(json.dumps(header, ensure_ascii=False) + '\n')
+        for row, inputs in enumerate(frame[INPUT_COLUMNS].itertuples(index=False, name=None)):
+            record = {'input': list(inputs)}
+            record.update({column: values[row] for column, (_, values) in expected.items()})
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+def load_golden(path=GOLDEN_PATH):
+    """
+    Retourne (DataFrame d'entrée, {colonne: (dtype, [valeurs encodées])}).
+    """
+    with open(path, encoding='utf-8') as f:
+        header = json.loads(f.readline())
+        records = [json.loads(line) for line in f]
+    frame = pd.DataFrame([record['input'] for record in records], columns=INPUT_COLUMNS)
+    expected = {
+        column: (dtype, [record[column] for record in records])
+        for column, dtype in header['dtypes'].items()
+    }
+    return frame, expected
+
+def compare(expected, actual, max_rows=5):
+    """
+    Liste des différences entre deux encodages de colonnes (vide si identiques).
+    """
+    problems = []
+    for column in expected.keys() | actual.keys():
+        if column not in actual:
+            problems.append(f"{column}: missing")
+            continue
+        if column not in expected:
+            problems.append(f"{column}: unexpected column")
+            continue
+        (expected_dtype, expected_values), (dtype, values) = expected[column], actual[column]
+        if dtype != expected_dtype:
+            problems.append(f"{column}: dtype {dtype} != {expected_dtype}")
+        if column_digest(values) != column_digest(expected_values):
+            rows = [row for row, (a, b) in enumerate(zip(values, expected_values)) if a != b]
+            if len(values) != len(expected_values):
+                problems.append(f"{column}: {len(values)} rows != {len(expected_values)}")
+            for row in rows[:max_rows]:
+                problems.append(f"{column}[{row}]: {values[row]} != {expected_values[row]}")
+    return problems
+
+def check_golden(path=GOLDEN_PATH, modes=EXTRACTION_MODES):
+    """
+    Vérifie chaque moteur contre le fichier golden. Retourne
+    {mode: [différences]}.
+    """
+    frame, expected = load_golden(path)
+    results = {}
+    for mode in modes:
+        options = {'mode': mode}
+        saved_min_rows = vectorized.PARALLEL_MIN_ROWS
+        if mode == 'parallel':
+            # Le corpus est petit : on force le passage par les processus
+            vectorized.PARALLEL_MIN_ROWS = 0
+            options.update(workers=2, chunk_size=max(1, len(frame) // 4))
+        try:
+            actual = encode_frame(classify_frame(frame, **options), columns=expected)
+        finally:
+            vectorized.PARALLEL_MIN_ROWS = saved_min_rows
+        results[mode] = compare(expected, actual)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check or regenerate the extractor golden corpus.")
+    parser.add_argument('--update', action='store_true',
+                        help="regenerate the golden file with the original extractors")
+    args = parser.parse_args(argv)
+
+    if args.update:
+        write_golden()
+        print(f"Golden corpus written to {GOLDEN_PATH}")
+        return 0
+
+    failed = False
+    for mode, problems in check_golden().items():
+        print(f"{mode}: {'OK' if not problems else f'{len(problems)} difference(s)'}")
+        for problem in problems:
+            print(f"  {problem}")
+        failed = failed or bool(problems)
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
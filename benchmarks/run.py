@@ -0,0 +1,137 @@
+# benchmarks/run.py
+"""
+Mesure du débit (lignes/s) et de la mémoire maximale de chaque extracteur
+et du pipeline complet, sur des descriptions synthétiques.
+
+    python -m benchmarks.run
+    python -m benchmarks.run --sizes 1000 100000 1000000 --modes vectorized parallel
+    python -m benchmarks.run --distinct 5000 --json bench.json
+
+La mémoire est mesurée avec tracemalloc dans une exécution séparée, pour
+ne pas fausser le chronométrage (--no-memory pour la désactiver).
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+from benchmarks.corpus import generate_frame
+from utils.data_processing import DESCRIPTION_COLUMN, EXTRACTION_MODES, classify_frame
+from utils.extractors import (
+    extracting_clarity,
+    extract_color,
+    extract_shape,
+    extract_dimensions,
+    extract_pcs_carat,
+    extract_gia_number,
+)
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+EXTRACTORS = {
+    'extract_shape': extract_shape,
+    'extracting_clarity': extracting_clarity,
+    'extract_color': extract_color,
+    'extract_gia_number': extract_gia_number,
+    'extract_dimensions': extract_dimensions,
+    'extract_pcs_carat': extract_pcs_carat,
+}
+
+# Au-delà, le moteur 'apply' et les extracteurs scalaires sont trop lents
+# pour être mesurés par défaut
+DEFAULT_SCALAR_MAX_ROWS = 100_000
+
+
+def measure(function, memory=True):
+    """
+    Exécute `function` et retourne (durée en secondes, pic mémoire en octets
+    ou None). Le pic mémoire est mesuré dans une seconde exécution.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            function()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return elapsed, peak
+
+def run_benchmarks(sizes=DEFAULT_SIZES, modes=EXTRACTION_MODES, distinct=None,
+                   memory=True, scalar_max_rows=DEFAULT_SCALAR_MAX_ROWS, seed=0):
+    """
+    Lance les mesures et retourne une liste de résultats
+    {'name', 'rows', 'seconds', 'rows_per_second', 'peak_bytes'}.
+    """
+    results = []
+    for rows in sizes:
+        frame = generate_frame(rows, seed=seed, distinct=distinct)
+        descriptions = frame[DESCRIPTION_COLUMN]
+
+        benchmarks = []
+        if rows <= scalar_max_rows:
+            benchmarks += [(name, lambda f=extractor: descriptions.map(f))
+                           for name, extractor in EXTRACTORS.items()]
+        for mode in modes:
+            if mode == 'apply' and rows > scalar_max_rows:
+                continue
+            benchmarks.append((f"pipeline[{mode}]", lambda m=mode: classify_frame(frame, mode=m)))
+
+        for name, function in benchmarks:
+            seconds, peak = measure(function, memory=memory)
+            result = {
+                'name': name,
+                'rows': rows,
+                'seconds': seconds,
+                'rows_per_second': rows / seconds if seconds else float('inf'),
+                'peak_bytes': peak,
+            }
+            results.append(result)
+            print(format_result(result), flush=True)
+    return results
+
+def format_result(result):
+    peak = result['peak_bytes']
+    memory = f"{peak / 2**20:10.1f} MiB" if peak is not None else f"{'-':>14}"
+    return (f"{result['name']:<28} {result['rows']:>9} rows "
+            f"{result['seconds']:9.3f} s {result['rows_per_second']:12.0f} rows/s {memory}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the extractors and the processing pipeline.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="numbers of rows to generate (default: 1k 10k 100k)")
+    parser.add_argument('--modes', nargs='+', choices=EXTRACTION_MODES, default=list(EXTRACTION_MODES),
+                        help="pipeline engines to measure")
+    parser.add_argument('--distinct', type=int, default=None,
+                        help="draw rows from this many distinct descriptions (default: all distinct)")
+    parser.add_argument('--scalar-max-rows', type=int, default=DEFAULT_SCALAR_MAX_ROWS,
+                        help="skip per-row extractors and the 'apply' engine above this size")
+    parser.add_argument('--no-memory', action='store_true', help="skip peak memory measurement")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        sizes=args.sizes,
+        modes=args.modes,
+        distinct=args.distinct,
+        memory=not args.no_memory,
+        scalar_max_rows=args.scalar_max_rows,
+        seed=args.seed,
+    )
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Index des numéros de certificat des fichiers traités : ajout de fichiers,
+recherche d'un certificat et détection des doublons.
+
+Exemples :
+    python certificate_index.py add "processed/*.xlsx"
+    python certificate_index.py lookup 1234567890 "GIA 2141438"
+    python certificate_index.py duplicates --across-files
+    python certificate_index.py sources
+"""
+
+import argparse
+import glob
+import os
+import sqlite3
+import sys
+
+import pandas as pd
+
+from utils.cert_index import DEFAULT_INDEX_PATH, CertificateIndex, index_file
+
+PROCESSED_EXTENSIONS = ('.xlsx', '.csv', '.parquet')
+
+
+def expand_processed(patterns):
+    """Fichiers traités correspondant aux chemins, dossiers ou motifs glob."""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, '**', '*')
+        paths.extend(path for path in glob.glob(pattern, recursive=True)
+                     if os.path.isfile(path) and path.lower().endswith(PROCESSED_EXTENSIONS))
+    return sorted(dict.fromkeys(os.path.abspath(path) for path in paths))
+
+def sheet_argument(value):
+    """Feuille Excel de --sheet : position si la valeur est un nombre, sinon nom."""
+    return int(value) if value.isdigit() else value
+
+def print_frame(frame, empty_message):
+    if frame.empty:
+        print(empty_message)
+    else:
+        with pd.option_context('display.max_rows', None, 'display.max_colwidth', 60, 'display.width', 200):
+            print(frame.to_string(index=False))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index and search certificate numbers of processed files.")
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH,
+                        help=f"SQLite index file (default: {DEFAULT_INDEX_PATH})")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add = commands.add_parser('add', help="index processed files (.xlsx, .csv, .parquet)")
+    add.add_argument('inputs', nargs='+', help="processed files, folders or glob patterns")
+    add.add_argument('--sheet', type=sheet_argument, default=0,
+                     help="sheet name or position (0 for the first) to read in Excel files "
+                          "(default: first sheet)")
+
+    lookup = commands.add_parser('lookup', help="find the files and rows of certificate numbers")
+    lookup.add_argument('certificates', nargs='+', help="certificate numbers")
+
+    duplicates = commands.add_parser('duplicates', help="list certificates found more than once")
+    duplicates.add_argument('--across-files', action='store_true',
+                            help="only certificates found in at least two files")
+    duplicates.add_argument('--limit', type=int, default=None, help="maximum number of certificates listed")
+
+    commands.add_parser('sources', help="list indexed files")
+    args = parser.parse_args(argv)
+
+    try:
+        index = CertificateIndex(args.index)
+        if args.command == 'add':
+            paths = expand_processed(args.inputs)
+            if not paths:
+                print("No processed files found.", file=sys.stderr)
+                return 2
+            failed = 0
+            for path in paths:
+                try:
+                    count = index_file(index, path, args.sheet)
+                except (KeyError, ValueError, ImportError, OSError) as e:
+                    failed += 1
+                    print(f"FAILED  {path}: {type(e).__name__}: {e}", flush=True)
+                else:
+                    print(f"OK      {path} ({count} certificates)", flush=True)
+            print(f"\n{len(index)} certificates indexed in {args.index}")
+            return 1 if failed else 0
+        if args.command == 'lookup':
+            print_frame(index.lookup(args.certificates), "No matching certificate.")
+        elif args.command == 'duplicates':
+            print_frame(index.duplicates(across_sources=args.across_files, limit=args.limit),
+                        "No duplicate certificate.")
+        else:
+            print_frame(index.sources(), "No indexed file.")
+    except sqlite3.Error as e:
+        print(f"Index error: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+Service HTTP local d'extraction, pour les outils qui ont besoin de la même
+classification que l'application Streamlit (nécessite uvicorn).
+
+Exemples :
+    python extraction_service.py --port 8765
+    curl -X POST localhost:8765/extract -H "Content-Type: application/json" \
+        -d '["CPD D/C ROUND WHITE, VS1, PCS/CTS 6"]'
+    curl -X POST localhost:8765/extract -H "Content-Type: application/x-ndjson" \
+        --data-binary @descriptions.ndjson
+    curl localhost:8765/health
+"""
+
+import argparse
+import sys
+
+from utils.cache import DEFAULT_CACHE_SIZE, DescriptionCache
+from utils.service import DEFAULT_HOST, DEFAULT_MAX_ROWS, DEFAULT_MAX_WAIT, DEFAULT_PORT, serve
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the description extractors over HTTP.")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"listening address (default: {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"listening port (default: {DEFAULT_PORT})")
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_ROWS,
+                        help="maximum descriptions extracted together in one micro-batch")
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT * 1000,
+                        help="time to wait for concurrent requests before extracting a micro-batch")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE,
+                        help="distinct descriptions kept in the extraction cache")
+    parser.add_argument('--log-level', default='info', help="uvicorn log level (default: info)")
+    args = parser.parse_args(argv)
+
+    try:
+        serve(
+            host=args.host,
+            port=args.port,
+            log_level=args.log_level,
+            max_rows=args.max_batch,
+            max_wait=args.max_wait_ms / 1000,
+            cache=DescriptionCache(args.cache_size),
+        )
+    except ImportError:
+        print("The extraction service requires uvicorn (pip install uvicorn).", file=sys.stderr)
+        return 2
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
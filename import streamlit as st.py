@@ -6,7 +6,7 @@ from utils.data_processing import load_data
 st.title("Diamond Classification")
 
 # Chargement des données
-uploaded_file = st.file_uploader("Upload a CSV file", type=["csv"])
+uploaded_file = st.file_uploader("Upload a CSV or Excel file", type=["csv", "xlsx"])
 
 if uploaded_file:
     # Charger et traiter les données
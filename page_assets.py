@@ -0,0 +1,67 @@
+"""
+Contenu statique de la page de l'application (styles, en-tête,
+instructions, pied de page), construit une seule fois par processus à
+l'import du module et non à chaque exécution du script Streamlit.
+
+Le logo est servi par le serveur Streamlit depuis le dossier static/
+(enableStaticServing dans .streamlit/config.toml) et mis en cache par le
+navigateur, au lieu d'être envoyé en base64 avec chaque rendu de la page.
+"""
+
+# URL du logo servi depuis static/
+LOGO_URL = 'app/static/logovdglobal.png'
+
+PAGE_CSS = """
+    <style>
+    .main {
+        padding: 0rem 5rem;
+    }
+    .header-container {
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        gap: 0px;
+        margin-bottom: 0;
+    }
+    .logo {
+        width: 150px;
+    }
+    .title-text {
+        margin: 0;
+        font-size: 2.5em;
+        color: white;
+    }
+    .subtitle-text {
+        font-size: 1.2rem;
+        color: #666;
+        text-align: center;
+        margin-top: 0;
+    }
+    </style>
+"""
+
+# En-tête avec logo et titre alignés
+HEADER_HTML = f"""
+    <div class='header-container'>
+        <img src='{LOGO_URL}' class='logo'>
+        <h1 class='title-text'>VD Global</h1>
+    </div>
+    <p class='subtitle-text'>Diamond Data Analysis Tool</p>
+"""
+
+INSTRUCTIONS_HTML = """
+    <div style='background-color: #2c3e50; color: white; padding: 2rem; border-radius: 0.5rem; margin: 2rem 0; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);'>
+        <h3 style='margin-bottom: 1rem; color: #3498db;'>Instructions</h3>
+        <p style='color: #ecf0f1; margin-bottom: 0.5rem;'>1. Upload one or more Excel files using the button below (all sheets are read)</p>
+        <p style='color: #ecf0f1; margin-bottom: 0.5rem;'>2. The tool will automatically process the data and extract key information</p>
+        <p style='color: #ecf0f1; margin-bottom: 0.5rem;'>3. Review the processed data in the interactive table</p>
+        <p style='color: #ecf0f1; margin-bottom: 0.5rem;'>4. Download the processed file for further use</p>
+    </div>
+"""
+
+FOOTER_HTML = """
+    <div style='text-align: center; padding: 2rem 0; margin-top: 3rem; border-top: 1px solid #eee;'>
+        <p>VD Global Diamond Analysis Tool</p>
+        <p style='color: #666; font-size: 0.8rem;'>© 2024 VD Global. All rights reserved.</p>
+    </div>
+"""
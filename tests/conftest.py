@@ -0,0 +1,28 @@
+# tests/conftest.py
+"""Fichiers Trade de test, écrits dans le dossier temporaire de pytest."""
+
+import pandas as pd
+import pytest
+
+DESCRIPTIONS = [
+    "CPD D/C ROUND WHITE VS1 (1.5-1.85) PCS/CTS 180 GIA 2141438",
+    "CUT & POLISHED DIAMOND PRINCESS G VVS2 4.1X4.2X2.6 GIA 7654321",
+    "POLISHED DIAMONDS EMERALD SI1 L(3-3.5)H(2-2.2) PC 40",
+    "CPD OVAL H IF 2.5MM NON CERT",
+]
+
+
+@pytest.fixture
+def trade_frame():
+    return pd.DataFrame({
+        'Description of the goods': DESCRIPTIONS,
+        'Quantity': [12, 3, 7, 1],
+        'Supplier': ['ALPHA', 'BETA', 'ALPHA', 'GAMMA'],
+    })
+
+@pytest.fixture
+def trade_workbook(tmp_path, trade_frame):
+    """Chemin d'un classeur .xlsx contenant `trade_frame`."""
+    path = tmp_path / 'trade.xlsx'
+    trade_frame.to_excel(path, index=False)
+    return path
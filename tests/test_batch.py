@@ -0,0 +1,47 @@
+# tests/test_batch.py
+import pandas as pd
+import pytest
+
+import batch_process
+from utils.batch import process_files
+from utils.cert_index import CertificateIndex
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_corrupt_file_is_reported_without_stopping_the_others(tmp_path, trade_workbook, workers):
+    corrupt = tmp_path / 'corrupt.xlsx'
+    corrupt.write_bytes(b'not a zip archive')
+    output_dir = tmp_path / 'processed'
+
+    summaries = process_files([str(corrupt), str(trade_workbook)], str(output_dir),
+                              export_format='csv', workers=workers)
+
+    assert [summary['input'] for summary in summaries] == [str(corrupt), str(trade_workbook)]
+    assert 'BadZipFile' in summaries[0]['error']
+    assert summaries[0]['output'] is None
+    assert summaries[1]['error'] is None
+    assert summaries[1]['rows'] == 4
+    assert len(pd.read_csv(summaries[1]['output'])) == 4
+
+def test_cli_processes_files_and_updates_the_certificate_index(tmp_path, trade_workbook, capsys):
+    output_dir = tmp_path / 'processed'
+    index_path = tmp_path / 'certificates.sqlite'
+
+    status = batch_process.main([str(trade_workbook), '--format', 'csv', '--output-dir', str(output_dir),
+                                 '--cert-index', str(index_path), '--workers', '1'])
+
+    assert status == 0
+    assert capsys.readouterr().out.startswith('OK      ')
+    assert len(pd.read_csv(output_dir / 'trade_processed.csv')) == 4
+    assert len(CertificateIndex(str(index_path)).lookup(['2141438', '7654321'])) == 2
+
+def test_cli_exit_codes(tmp_path, trade_workbook, capsys):
+    corrupt = tmp_path / 'corrupt.xlsx'
+    corrupt.write_bytes(b'not a zip archive')
+    output_dir = str(tmp_path / 'processed')
+
+    assert batch_process.main([str(tmp_path / 'missing-*.xlsx'), '--output-dir', output_dir]) == 2
+    assert batch_process.main([str(corrupt), str(trade_workbook), '--output-dir', output_dir,
+                               '--workers', '1']) == 1
+    out = capsys.readouterr().out
+    assert 'FAILED  ' in out and '1/2 files processed' in out
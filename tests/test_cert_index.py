@@ -0,0 +1,56 @@
+# tests/test_cert_index.py
+import pandas as pd
+
+import certificate_index
+from utils.cert_index import CertificateIndex, index_file, normalize_certificate
+from utils.data_processing import classify_frame
+
+
+def test_lookup_and_duplicates_across_sources(tmp_path, trade_frame):
+    index = CertificateIndex(str(tmp_path / 'certificates.sqlite'))
+    processed = classify_frame(trade_frame)
+
+    assert index.add_frame(processed, 'a.xlsx') == 2
+    assert index.add_frame(processed, 'b.xlsx') == 2
+    # Réindexer une source remplace ses lignes
+    assert index.add_frame(processed, 'a.xlsx') == 2
+    assert len(index) == 4
+
+    found = index.lookup("GIA 2141438")
+    assert found['source'].tolist() == ['a.xlsx', 'b.xlsx']
+    assert found['row'].tolist() == [2, 2]
+    assert found['shape'].tolist() == ['Round Brilliant Cut'] * 2
+    assert found['supplier'].tolist() == ['ALPHA'] * 2
+
+    duplicates = index.duplicates(across_sources=True)
+    assert sorted(duplicates['certificate']) == ['2141438', '7654321']
+    assert set(duplicates['sources']) == {2}
+
+    index.remove_source('b.xlsx')
+    assert index.duplicates().empty
+    assert index.sources()['source'].tolist() == ['a.xlsx']
+
+def test_index_processed_file(tmp_path, trade_frame):
+    path = tmp_path / 'trade_processed.xlsx'
+    classify_frame(trade_frame).to_excel(path, index=False)
+    index = CertificateIndex(str(tmp_path / 'certificates.sqlite'))
+
+    assert index_file(index, str(path)) == 2
+    assert index.lookup(7654321)['row'].tolist() == [3]
+
+def test_cli_sheet_by_position_or_name(tmp_path, trade_frame):
+    path = tmp_path / 'trade_processed.xlsx'
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame({'Notes': ["summary"]}).to_excel(writer, sheet_name='Notes', index=False)
+        classify_frame(trade_frame).to_excel(writer, sheet_name='Processed', index=False)
+    index_path = str(tmp_path / 'certificates.sqlite')
+
+    for sheet in ['1', 'Processed']:
+        assert certificate_index.main(['--index', index_path, 'add', str(path), '--sheet', sheet]) == 0
+        assert len(CertificateIndex(index_path)) == 2
+
+def test_normalize_certificate():
+    assert normalize_certificate("GIA 2141438") == '2141438'
+    assert normalize_certificate(2141438.0) == '2141438'
+    assert normalize_certificate("UNKNOWN") is None
+    assert normalize_certificate(float('nan')) is None
@@ -0,0 +1,63 @@
+# tests/test_extractors.py
+import pandas as pd
+import pytest
+
+from utils.data_processing import classify_frame, process_data
+from utils.extractors import (
+    extract_color,
+    extract_dimensions,
+    extract_gia_number,
+    extract_pcs_carat,
+    extract_shape,
+    extracting_clarity,
+)
+
+# Description -> (Shape, Clarity, Color, Certi Number, PCS/Carat)
+LABELS = {
+    "ROUND VS1 GIA 2141438 PCS/CTS 180": ('Round Brilliant Cut', 'VS1', 'UNKNOWN', '2141438', '180'),
+    "PRINCESS G VVS2 4.1X4.2X2.6 GIA 7654321": ('Princess Cut', 'VVS2', 'G', '7654321', 'N/A'),
+    "RB D FL 1.05/1.08/0.65 GIA:1234567890": ('Round Brilliant Cut', 'FL', 'D', '1234567890', 'N/A'),
+    "MARQUISE I1 (1.0-1.5) 150 P/CT": ('Marquise Cut', 'I1', 'UNKNOWN', 'UNKNOWN', '150'),
+    "CUSHION WHITE VVS 0.9MM - 1.2MM": ('Cushion Cut', 'VVS', 'White', 'UNKNOWN', 'N/A'),
+    "XYZ STONE": ('N/A', None, 'UNKNOWN', 'UNKNOWN', 'N/A'),
+    None: ('N/A', None, 'UNKNOWN', 'UNKNOWN', 'N/A'),
+}
+
+# Description -> (Length, Width, Height, MM Range, Depth)
+DIMENSIONS = {
+    "PRINCESS G VVS2 4.1X4.2X2.6 GIA 7654321": (4.1, 4.2, 2.6, '4.1-4.2', None),
+    "EMERALD SI1 L(3.0-3.5)H(2.0-2.2) PC 40": (3.0, 3.0, '2.0-2.2', '3.0-3.5', None),
+    "CPD PEAR F VS2 DIA MM 1.5-1.85 HEIGHT MM 0.9-1.1 200 PCS": (1.5, 1.5, '0.9-1.1', '1.5-1.85', None),
+    "OVAL H IF 2.5MM NON CERT": (2.5, 2.5, None, '2.5', None),
+    "CUSHION WHITE VVS 0.9MM - 1.2MM": (0.9, 1.2, None, '0.9-1.2', None),
+    "XYZ STONE": (None, None, None, None, None),
+}
+
+
+@pytest.mark.parametrize('description', list(LABELS))
+def test_label_extractors(description):
+    extracted = (extract_shape(description), extracting_clarity(description),
+                 extract_color(description), extract_gia_number(description),
+                 extract_pcs_carat(description))
+    assert extracted == LABELS[description]
+
+@pytest.mark.parametrize('description', list(DIMENSIONS))
+def test_extract_dimensions(description):
+    assert extract_dimensions(description) == DIMENSIONS[description]
+
+def test_classify_frame_modes_agree(trade_frame):
+    frames = {mode: classify_frame(trade_frame, mode=mode) for mode in ['vectorized', 'apply']}
+
+    pd.testing.assert_frame_equal(frames['vectorized'], frames['apply'])
+    df = frames['vectorized']
+    assert 'Depth' not in df.columns
+    assert df['Height'].iloc[1] == '2.6'
+    assert df['Height'].isna().tolist() == [True, False, True, True]
+    assert df['Pieces per Carat Weight'].iloc[0] == 12 * 180
+    pd.testing.assert_frame_equal(process_data(trade_frame, mappings={}), df)
+
+def test_classify_frame_rejects_bad_input(trade_frame):
+    with pytest.raises(ValueError):
+        classify_frame(trade_frame, mode='regex')
+    with pytest.raises(KeyError):
+        classify_frame(trade_frame.drop(columns=['Description of the goods']))
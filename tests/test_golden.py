@@ -0,0 +1,10 @@
+# tests/test_golden.py
+import pytest
+
+from benchmarks.golden import check_golden
+from utils.data_processing import EXTRACTION_MODES
+
+
+@pytest.mark.parametrize('mode', EXTRACTION_MODES)
+def test_engine_matches_golden_corpus(mode):
+    assert check_golden(modes=[mode]) == {mode: []}
@@ -0,0 +1,51 @@
+# tests/test_incremental.py
+import pandas as pd
+
+from utils.data_processing import classify_frame
+from utils.incremental import OUTPUT_COLUMNS, ResultStore, classify_frame_incremental
+
+
+def test_reprocessing_reuses_stored_rows(tmp_path, trade_frame):
+    store = ResultStore(str(tmp_path / 'results.sqlite'))
+
+    first = classify_frame_incremental(trade_frame, store)
+    assert first.attrs['incremental_stats'] == {'rows': 4, 'reused': 0, 'processed': 4}
+    assert len(store) == 4
+
+    grown = pd.concat([trade_frame, pd.DataFrame({
+        'Description of the goods': ["CPD MARQUISE F VS2 1.2-1.3MM PCS/CTS 250"],
+        'Quantity': [5],
+        'Supplier': ['BETA'],
+    })], ignore_index=True)
+    second = classify_frame_incremental(grown, store)
+    assert second.attrs['incremental_stats'] == {'rows': 5, 'reused': 4, 'processed': 1}
+
+    # Même résultat qu'un traitement complet
+    expected = classify_frame(grown)
+    pd.testing.assert_frame_equal(second[expected.columns], expected)
+
+def test_changed_quantity_is_processed_again(tmp_path, trade_frame):
+    store = ResultStore(str(tmp_path / 'results.sqlite'))
+    classify_frame_incremental(trade_frame, store)
+
+    changed = trade_frame.assign(Quantity=[12, 3, 7, 2])
+    result = classify_frame_incremental(changed, store)
+    assert result.attrs['incremental_stats']['processed'] == 1
+    expected = classify_frame(changed)
+    pd.testing.assert_frame_equal(result[OUTPUT_COLUMNS], expected[OUTPUT_COLUMNS])
+
+def test_store_keeps_the_most_recently_used_rows(tmp_path, trade_frame):
+    store = ResultStore(str(tmp_path / 'results.sqlite'), max_rows=4)
+    classify_frame_incremental(trade_frame.iloc[:2], store)
+    classify_frame_incremental(trade_frame.iloc[2:], store)
+    classify_frame_incremental(trade_frame.iloc[[0]], store)
+    assert len(store) == 4
+
+    # Dépassement : la base est ramenée à 90 % de max_rows en supprimant
+    # les lignes les moins récemment utilisées
+    classify_frame_incremental(pd.DataFrame({
+        'Description of the goods': ["CPD MARQUISE F VS2 1.2-1.3MM PCS/CTS 250"], 'Quantity': [5],
+    }), store)
+    assert len(store) == 3
+    assert classify_frame_incremental(trade_frame.iloc[[0]], store).attrs['incremental_stats']['reused'] == 1
+    assert classify_frame_incremental(trade_frame.iloc[[1]], store).attrs['incremental_stats']['reused'] == 0
@@ -0,0 +1,25 @@
+# tests/test_parallel.py
+import pandas as pd
+
+from utils import vectorized
+from utils.excel_io import read_classified_excel
+
+
+def test_streamed_parallel_mode_sends_batches_to_one_pool(monkeypatch, trade_workbook):
+    calls = []
+    extract_parallel = vectorized._extract_parallel
+
+    def recording(descriptions, workers, chunk_size, executor=None):
+        calls.append(executor)
+        return extract_parallel(descriptions, workers, chunk_size, executor)
+
+    monkeypatch.setattr(vectorized, '_extract_parallel', recording)
+    monkeypatch.setattr(vectorized, 'PARALLEL_MIN_CHUNK', 1)
+
+    parallel = read_classified_excel(trade_workbook, batch_size=2, mode='parallel', workers=2)
+    serial = read_classified_excel(trade_workbook, batch_size=2, mode='vectorized')
+
+    # Un appel par lot, sur le même pool démarré pour toute la lecture
+    assert len(calls) == 2
+    assert calls[0] is not None and calls[0] is calls[1]
+    pd.testing.assert_frame_equal(parallel, serial)
@@ -0,0 +1,40 @@
+# tests/test_schema.py
+import pandas as pd
+
+from utils.aggregation import summarize
+from utils.data_processing import classify_frame
+from utils.schema import MISSING_VALUES, compact_frame
+from utils.table_view import filter_options
+
+
+def test_missing_values_become_na_in_every_column():
+    df = pd.DataFrame({'Description of the goods': ["XYZ STONE", "CPD PRINCESS G SI1 2.1MM"]})
+    raw = classify_frame(df, mode='vectorized')
+    compact = compact_frame(raw)
+
+    for column, missing in MISSING_VALUES.items():
+        assert raw[column].iloc[0] == missing
+        assert pd.isna(compact[column].iloc[0])
+    assert filter_options(compact, 'Shape') == ['Princess Cut']
+    assert filter_options(compact, 'Color') == ['G']
+
+def test_summary_counts_missing_values_before_and_after_compaction(trade_frame):
+    df = pd.concat([trade_frame, pd.DataFrame({'Description of the goods': ["XYZ STONE"]})],
+                   ignore_index=True)
+    raw = classify_frame(df, mode='vectorized')
+    raw_summary, compact_summary = summarize(raw), summarize(compact_frame(raw))
+
+    assert raw_summary['unique'] == compact_summary['unique']
+    for column in ['Shape', 'Color', 'Clarity']:
+        assert (raw_summary['counts'][column].to_dict()
+                == compact_summary['counts'][column].to_dict()
+                == raw[column].value_counts().to_dict())
+    assert compact_summary['counts']['Color']['UNKNOWN'] == 1
+    assert compact_summary['counts']['Shape']['N/A'] == 1
+
+def test_compaction_keeps_range_columns(trade_frame):
+    raw = classify_frame(trade_frame, mode='vectorized')
+    compact = compact_frame(raw)
+
+    for column in ['MM Range', 'Height']:
+        assert compact[column].astype(object).tolist() == raw[column].astype(object).tolist()
@@ -0,0 +1,105 @@
+# tests/test_service.py
+import asyncio
+import json
+
+import pytest
+
+from utils import service
+from utils.service import NDJSON_TYPE, SERVICE_COLUMNS, create_app
+
+
+def call(app, method, path, body=b'', content_type='application/json', sent=None):
+    """
+    Envoie une requête à l'application ASGI ; retourne (statut, corps).
+    Les messages envoyés par l'application sont ajoutés à `sent` s'il est fourni.
+    """
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = [] if sent is None else sent
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {'type': 'http', 'method': method, 'path': path,
+             'headers': [(b'content-type', content_type.encode('latin-1'))]}
+    asyncio.run(app(scope, receive, send))
+    status = sent[0]['status']
+    return status, b''.join(message.get('body', b'') for message in sent[1:])
+
+@pytest.fixture
+def descriptions(trade_frame):
+    return trade_frame['Description of the goods'].tolist()
+
+def test_extract_json_keeps_request_order(descriptions):
+    app = create_app(max_wait=0)
+    status, body = call(app, 'POST', '/extract', json.dumps(descriptions + [None]).encode())
+
+    assert status == 200
+    records = json.loads(body)
+    assert len(records) == 5
+    assert all(list(record) == SERVICE_COLUMNS for record in records)
+    assert records[0]['Shape'] == 'Round Brilliant Cut'
+    assert records[0]['Certi Number'] == '2141438'
+    assert records[1]['Clarity'] == 'VVS2'
+
+def test_extract_ndjson_streams_one_line_per_description(descriptions):
+    app = create_app(max_wait=0)
+    body = '\n'.join(json.dumps(description) for description in descriptions).encode()
+    status, response = call(app, 'POST', '/extract', body, content_type=NDJSON_TYPE)
+
+    assert status == 200
+    records = [json.loads(line) for line in response.decode().splitlines()]
+    assert [record['Shape'] for record in records] == [
+        'Round Brilliant Cut', 'Princess Cut', 'Emerald Cut', 'Oval Cut']
+
+def test_invalid_requests_and_health(descriptions):
+    app = create_app(max_wait=0)
+    assert call(app, 'POST', '/extract', b'{"not": "a list"}')[0] == 400
+    assert call(app, 'POST', '/extract', b'[1, 2]')[0] == 400
+    assert call(app, 'GET', '/extract')[0] == 405
+    assert call(app, 'GET', '/missing')[0] == 404
+
+    call(app, 'POST', '/extract', json.dumps(descriptions).encode())
+    status, body = call(app, 'GET', '/health')
+    health = json.loads(body)
+    assert status == 200
+    assert health['status'] == 'ok'
+    assert health['requests'] == 3
+    assert health['errors'] == 2
+    assert health['descriptions'] == 4
+
+def test_values_not_found_are_null():
+    app = create_app(max_wait=0)
+    status, body = call(app, 'POST', '/extract', json.dumps(["XYZ STONE", None]).encode())
+
+    assert status == 200
+    for record in json.loads(body):
+        assert set(record.values()) == {None}
+
+def test_error_after_stream_start_ends_the_body(descriptions, monkeypatch):
+    monkeypatch.setattr(service, 'STREAM_CHUNK_ROWS', 2)
+    app = create_app(max_wait=0)
+    extract = app.batcher.extract
+    calls = []
+
+    async def failing_extract(chunk):
+        calls.append(chunk)
+        if len(calls) > 1:
+            raise RuntimeError("batch failed")
+        return await extract(chunk)
+
+    monkeypatch.setattr(app.batcher, 'extract', failing_extract)
+    body = '\n'.join(json.dumps(description) for description in descriptions).encode()
+    sent = []
+    with pytest.raises(RuntimeError):
+        call(app, 'POST', '/extract', body, content_type=NDJSON_TYPE, sent=sent)
+
+    assert [message['type'] for message in sent].count('http.response.start') == 1
+    assert sent[0]['status'] == 200
+    assert not sent[-1].get('more_body', False)
+    response = b''.join(message.get('body', b'') for message in sent[1:])
+    records = [json.loads(line) for line in response.decode().splitlines()]
+    assert [record.get('Shape') for record in records[:2]] == ['Round Brilliant Cut', 'Princess Cut']
+    assert records[-1] == {'error': "extraction failed"}
@@ -0,0 +1,128 @@
+# utils/aggregation.py
+"""
+Agrégats du tableau de résultats pour les indicateurs et les graphiques.
+
+Un seul groupby sur les colonnes catégorielles (Shape, Clarity, Color,
+Supplier) compte les lignes et additionne la quantité de chaque
+combinaison. Les comptages par colonne, le nombre de valeurs distinctes et
+les tableaux croisés sont ensuite dérivés de ce résultat, bien plus petit
+que le tableau complet, sans nouveau parcours des lignes.
+
+Les combinaisons comptées lot par lot s'additionnent (merge_combinations) :
+les indicateurs d'un traitement en cours sont mis à jour sans reparcourir
+les lots déjà traités.
+
+La répartition par taille regroupe les lignes par tranche de la borne
+inférieure de taille (Length Min), calculée directement sur la colonne
+numérique.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.schema import MISSING_VALUES
+
+SUMMARY_COLUMNS = ['Shape', 'Clarity', 'Color', 'Supplier']
+QUANTITY_COLUMN = 'Quantity'
+
+# Largeur des tranches de taille, en mm
+SIZE_COLUMN = 'Length Min'
+SIZE_BUCKET_MM = 0.5
+
+
+def _quantity(df):
+    if QUANTITY_COLUMN in df.columns:
+        return pd.to_numeric(df[QUANTITY_COLUMN], errors='coerce')
+    return pd.Series(float('nan'), index=df.index)
+
+def combination_counts(df):
+    """
+    Une ligne par combinaison de valeurs des colonnes de SUMMARY_COLUMNS
+    présentes : nombre de lignes ('rows') et somme des quantités
+    ('quantity', quantités non numériques ignorées). Les valeurs
+    manquantes forment leur propre groupe ; dans les colonnes d'un
+    extracteur, elles prennent sa valeur « non trouvé »
+    (utils.schema.MISSING_VALUES), comme dans un tableau non compacté.
+    """
+    columns = [column for column in SUMMARY_COLUMNS if column in df.columns]
+    frame = df[columns].assign(_quantity=_quantity(df).to_numpy())
+    combos = (frame.groupby(columns, dropna=False, sort=False, observed=True)['_quantity']
+              .agg(['size', 'sum'])
+              .rename(columns={'size': 'rows', 'sum': 'quantity'})
+              .reset_index())
+    for column in columns:
+        if column in MISSING_VALUES:
+            values = combos[column].astype(object)
+            combos[column] = values.where(values.notna(), MISSING_VALUES[column])
+    return combos
+
+def merge_combinations(frames):
+    """
+    Additionne des résultats de combination_counts (lots d'un même tableau)
+    en une ligne par combinaison.
+    """
+    combos = pd.concat(frames, ignore_index=True)
+    columns = [column for column in SUMMARY_COLUMNS if column in combos.columns]
+    return (combos.groupby(columns, dropna=False, sort=False, observed=True)[['rows', 'quantity']]
+            .sum()
+            .reset_index())
+
+def column_counts(combos):
+    """
+    {colonne: Series valeur -> nombre de lignes}, comme value_counts(), à
+    partir de combination_counts.
+    """
+    counts = {}
+    for column in SUMMARY_COLUMNS:
+        if column not in combos.columns:
+            continue
+        values = (combos.groupby(column, sort=False, observed=True)['rows'].sum()
+                  .sort_values(ascending=False, kind='stable'))
+        values.name = 'count'
+        counts[column] = values
+    return counts
+
+def summarize(df):
+    """
+    Agrégats du tableau : {'rows', 'counts', 'unique', 'crosstab', 'sizes'}.
+
+    counts : {colonne: Series valeur -> nombre de lignes}, comme value_counts().
+    unique : {colonne: nombre de valeurs distinctes}, comme nunique().
+    crosstab : quantités par forme (lignes) et clarté (colonnes).
+    sizes : répartition par tranche de taille (size_distribution).
+    """
+    combos = combination_counts(df)
+    counts = column_counts(combos)
+    return {
+        'rows': len(df),
+        'counts': counts,
+        'unique': {column: len(values) for column, values in counts.items()},
+        'crosstab': crosstab(combos, 'Shape', 'Clarity'),
+        'sizes': size_distribution(df),
+    }
+
+def crosstab(combos, index, columns, values='quantity'):
+    """
+    Tableau croisé `index` x `columns` de la colonne `values` ('quantity'
+    ou 'rows') de combination_counts, sans valeurs manquantes.
+    """
+    table = combos.dropna(subset=[index, columns]).pivot_table(
+        index=index, columns=columns, values=values, aggfunc='sum', fill_value=0, observed=True)
+    table.columns.name = columns
+    return table
+
+def size_distribution(df, bucket=SIZE_BUCKET_MM):
+    """
+    Nombre de lignes ('rows') et somme des quantités ('quantity') par
+    tranche de `bucket` mm de la taille minimale, indexées par la borne
+    inférieure de la tranche. Les lignes sans taille sont ignorées.
+    """
+    if SIZE_COLUMN not in df.columns:
+        return pd.DataFrame(columns=['rows', 'quantity'])
+    sizes = pd.to_numeric(df[SIZE_COLUMN], errors='coerce').to_numpy(dtype='float64')
+    buckets = np.round(np.floor(sizes / bucket) * bucket, 6)
+    frame = (pd.DataFrame({'size': buckets, '_quantity': _quantity(df).to_numpy()})
+             .dropna(subset=['size']))
+    return (frame.groupby('size')['_quantity']
+            .agg(['size', 'sum'])
+            .rename(columns={'size': 'rows', 'sum': 'quantity'}))
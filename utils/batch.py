@@ -0,0 +1,135 @@
+# utils/batch.py
+"""
+Traitement par lots de fichiers Trade, sans interface Streamlit.
+
+Chaque fichier est lu, classifié et exporté avec les mêmes fonctions que
+l'application (utils.excel_io, utils.data_processing). Les fichiers sont
+répartis sur plusieurs processus.
+"""
+
+import glob
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from utils.cert_index import CertificateIndex
+from utils.data_processing import classify_frame
+from utils.excel_io import DEFAULT_BATCH_SIZE, EXPORT_FORMATS, export_bytes, read_classified_excel
+from utils.incremental import ResultStore, classify_frame_incremental
+from utils.schema import compact_frame
+from utils.vectorized import process_pool
+
+INPUT_EXTENSIONS = ('.xlsx', '.csv')
+
+
+def expand_inputs(patterns):
+    """
+    Liste triée et sans doublon des fichiers correspondant aux chemins ou
+    motifs glob donnés ('**' est récursif). Les dossiers sont parcourus
+    à la recherche de fichiers .xlsx et .csv.
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = [str(path) for path in Path(pattern).rglob('*')
+                       if path.suffix.lower() in INPUT_EXTENSIONS]
+        else:
+            matches = glob.glob(pattern, recursive=True)
+            if not matches and os.path.exists(pattern):
+                matches = [pattern]
+        paths.extend(match for match in matches if os.path.isfile(match))
+    return sorted(dict.fromkeys(os.path.abspath(path) for path in paths))
+
+def output_path(input_path, output_dir, export_format):
+    """Chemin du fichier traité : <output_dir>/<nom>_processed.<extension>."""
+    extension = EXPORT_FORMATS[export_format][0]
+    return os.path.join(output_dir, f"{Path(input_path).stem}_processed.{extension}")
+
+def process_file(input_path, output_dir, export_format='xlsx', sheet_name=None,
+                 batch_size=DEFAULT_BATCH_SIZE, store_path=None, compact=False, index_path=None):
+    """
+    Traite un fichier et écrit le résultat. Retourne un résumé
+    {'input', 'output', 'rows', 'seconds', 'error'} ; une erreur sur un
+    fichier n'interrompt pas le traitement des autres. Avec `store_path`,
+    les résultats déjà présents dans cette base SQLite sont réutilisés
+    (voir utils.incremental). `compact` écrit le schéma compact
+    (voir utils.schema). Avec `index_path`, les certificats du fichier
+    écrit sont ajoutés à cet index (voir utils.cert_index).
+    """
+    start = time.perf_counter()
+    summary = {'input': input_path, 'output': None, 'rows': 0, 'seconds': 0.0, 'error': None}
+    try:
+        store = ResultStore(store_path) if store_path else None
+        if input_path.lower().endswith('.csv'):
+            frame = pd.read_csv(input_path)
+            if store is not None:
+                df = classify_frame_incremental(frame, store)
+            else:
+                df = classify_frame(frame)
+        else:
+            df = read_classified_excel(input_path, sheet_name=sheet_name, batch_size=batch_size,
+                                       store=store)
+        if compact:
+            df = compact_frame(df)
+        data = export_bytes(df, export_format)
+        destination = output_path(input_path, output_dir, export_format)
+        with open(destination, 'wb') as f:
+            f.write(data)
+        if index_path:
+            CertificateIndex(index_path).add_frame(df, os.path.abspath(destination))
+        summary.update(output=destination, rows=len(df))
+    except Exception as e:
+        # Fichier illisible (archive corrompue, format inattendu...) ou
+        # colonne manquante : l'erreur est rapportée pour ce fichier seulement
+        summary['error'] = f"{type(e).__name__}: {e}"
+    summary['seconds'] = time.perf_counter() - start
+    return summary
+
+def process_files(paths, output_dir, export_format='xlsx', workers=None, sheet_name=None,
+                  batch_size=DEFAULT_BATCH_SIZE, store_path=None, compact=False, index_path=None,
+                  on_result=None):
+    """
+    Traite les fichiers en parallèle sur `workers` processus (None : nombre
+    de cœurs) et retourne les résumés dans l'ordre des fichiers.
+    `on_result(summary)` est appelé à la fin de chaque fichier.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {export_format!r}")
+    destinations = [output_path(path, output_dir, export_format) for path in paths]
+    if len(set(destinations)) != len(destinations):
+        raise ValueError("Several input files have the same name; "
+                         "process them into separate output folders")
+    os.makedirs(output_dir, exist_ok=True)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(paths)))
+    arguments = (output_dir, export_format, sheet_name, batch_size, store_path, compact, index_path)
+
+    summaries = []
+    if workers == 1:
+        for path in paths:
+            summaries.append(process_file(path, *arguments))
+            if on_result is not None:
+                on_result(summaries[-1])
+        return summaries
+
+    with process_pool(workers) as executor:
+        futures = [executor.submit(process_file, path, *arguments) for path in paths]
+        for future in futures:
+            summaries.append(future.result())
+            if on_result is not None:
+                on_result(summaries[-1])
+    return summaries
+
+def throughput_summary(summaries, elapsed):
+    """Totaux : fichiers traités / en erreur, lignes, durée et lignes par seconde."""
+    rows = sum(summary['rows'] for summary in summaries)
+    return {
+        'files': len(summaries),
+        'failed': sum(1 for summary in summaries if summary['error']),
+        'rows': rows,
+        'seconds': elapsed,
+        'rows_per_second': rows / elapsed if elapsed > 0 else 0.0,
+    }
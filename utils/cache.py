@@ -0,0 +1,96 @@
+# utils/cache.py
+"""
+Cache LRU borné des résultats d'extraction, indexé par description.
+
+Une même description revient souvent d'un fichier Trade à l'autre : le cache
+peut être conservé entre plusieurs imports (par exemple dans la session
+Streamlit) pour ne pas relancer les extracteurs sur des chaînes déjà vues.
+
+Contient aussi le réglage du cache des fichiers traités (empreinte du
+contenu, nombre d'entrées, durée de vie), utilisé par l'application.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_CACHE_SIZE = 100_000
+
+# Cache des fichiers traités : nombre de fichiers conservés et durée de vie
+# en secondes, modifiables par variables d'environnement
+RESULT_CACHE_MAX_ENTRIES = int(os.environ.get('VDG_RESULT_CACHE_MAX_ENTRIES', '8'))
+RESULT_CACHE_TTL = float(os.environ.get('VDG_RESULT_CACHE_TTL', '3600'))
+
+
+def content_digest(data):
+    """
+    Empreinte SHA-256 du contenu d'un fichier (octets), utilisée comme clé
+    de cache : deux imports du même fichier donnent la même clé.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+class DescriptionCache:
+    """
+    Cache LRU : description -> tuple des valeurs extraites (dans l'ordre de
+    utils.vectorized.EXTRACTED_COLUMNS). Au-delà de `maxsize` entrées, les
+    descriptions les moins récemment utilisées sont évincées.
+    """
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, description):
+        return description in self._entries
+
+    def get_many(self, descriptions):
+        """
+        Retourne un dictionnaire {description: valeurs} pour les descriptions
+        présentes dans le cache, et met à jour les compteurs hits / misses.
+        """
+        found = {}
+        with self._lock:
+            for description in descriptions:
+                values = self._entries.get(description)
+                if values is None:
+                    continue
+                self._entries.move_to_end(description)
+                found[description] = values
+            self.hits += len(found)
+            self.misses += len(descriptions) - len(found)
+        return found
+
+    def put_many(self, items):
+        """
+        Ajoute des paires (description, valeurs) puis évince les entrées
+        les plus anciennes si la taille maximale est dépassée.
+        """
+        with self._lock:
+            for description, values in items:
+                self._entries[description] = values
+                self._entries.move_to_end(description)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    @property
+    def hit_rate(self):
+        """Proportion de recherches servies par le cache (0.0 si aucune)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        """Vide le cache et remet les compteurs à zéro."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,212 @@
+# utils/cert_index.py
+"""
+Index des numéros de certificat (GIA) des fichiers traités, dans une base
+SQLite locale : pour chaque certificat, le fichier et la ligne où il
+apparaît, avec les attributs principaux (forme, clarté, couleur, quantité,
+fournisseur, description).
+
+La table est indexée sur le numéro de certificat (B-tree) : une recherche
+coûte O(log n) quel que soit le nombre de lignes indexées, sans relire les
+fichiers Excel. Les certificats présents plusieurs fois (même fichier ou
+fichiers différents) sont obtenus par un regroupement sur ce même index.
+
+Réindexer un fichier remplace ses lignes : l'index reste à jour quand un
+fichier est retraité.
+"""
+
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_INDEX_PATH = os.environ.get(
+    'VDG_CERT_INDEX', os.path.join(os.path.expanduser('~'), '.vd_global', 'certificates.sqlite'))
+
+CERTIFICATE_COLUMN = 'Certi Number'
+
+# Colonne du fichier traité -> colonne de l'index
+INDEX_ATTRIBUTES = {
+    'Shape': 'shape',
+    'Clarity': 'clarity',
+    'Color': 'color',
+    'Quantity': 'quantity',
+    'Supplier': 'supplier',
+    'Description of the goods': 'description',
+}
+
+# Numéro de certificat dans une valeur saisie ("GIA 1234567", "1234567"...),
+# même longueur que les formats d'extract_gia_number
+_CERTIFICATE_PATTERN = re.compile(r'\d{5,14}')
+
+# Nombre de certificats par requête SQL (limite de paramètres de SQLite)
+_LOOKUP_CHUNK = 500
+
+# Les lignes de données d'un fichier traité commencent après l'en-tête
+_FIRST_DATA_ROW = 2
+
+
+def normalize_certificate(value):
+    """
+    Numéro de certificat (chaîne de chiffres) d'une valeur de la colonne
+    Certi Number ou d'une saisie ; None si la valeur n'en contient pas
+    ("UNKNOWN", vide...). Un nombre relu depuis Excel (1234567.0) est accepté.
+    """
+    if value is None:
+        return None
+    if isinstance(value, float):
+        if value != value or not value.is_integer():
+            return None
+        value = int(value)
+    match = _CERTIFICATE_PATTERN.search(str(value))
+    return match.group(0) if match else None
+
+
+class CertificateIndex:
+    """
+    Base SQLite certificat -> (fichier, ligne, attributs). Une connexion
+    est ouverte par opération, comme utils.incremental.ResultStore.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        attributes = ', '.join(INDEX_ATTRIBUTES.values())
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(f'CREATE TABLE IF NOT EXISTS certificates '
+                         f'(certificate TEXT NOT NULL, source TEXT NOT NULL, row INTEGER NOT NULL, '
+                         f'{attributes})')
+            conn.execute('CREATE INDEX IF NOT EXISTS certificates_by_number '
+                         'ON certificates (certificate)')
+            conn.execute('CREATE INDEX IF NOT EXISTS certificates_by_source '
+                         'ON certificates (source)')
+            conn.execute('CREATE TABLE IF NOT EXISTS sources '
+                         '(source TEXT PRIMARY KEY, rows INTEGER, certificates INTEGER, '
+                         'indexed_at REAL)')
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def __len__(self):
+        with self._connect() as conn:
+            return conn.execute('SELECT COUNT(*) FROM certificates').fetchone()[0]
+
+    def add_frame(self, df, source):
+        """
+        Indexe les certificats d'un tableau traité (colonne Certi Number)
+        sous le nom `source`, en remplaçant les lignes déjà indexées pour
+        cette source. `row` est le numéro de ligne dans le fichier traité
+        (en-tête en ligne 1). Retourne le nombre de certificats indexés.
+        """
+        if CERTIFICATE_COLUMN not in df.columns:
+            raise KeyError(f"'{CERTIFICATE_COLUMN}' column not found")
+        certificates = np.array([normalize_certificate(value)
+                                 for value in df[CERTIFICATE_COLUMN].tolist()], dtype=object)
+        positions = np.array([position for position, certificate in enumerate(certificates)
+                              if certificate is not None], dtype=np.int64)
+        present = [column for column in INDEX_ATTRIBUTES if column in df.columns]
+        names = ['certificate', 'source', 'row'] + [INDEX_ATTRIBUTES[column] for column in present]
+
+        # Lignes avec un certificat, triées par numéro : les insertions dans
+        # l'index B-tree se font dans l'ordre
+        positions = positions[np.argsort(certificates[positions].astype(str), kind='stable')]
+        columns = [certificates[positions].tolist(), [source] * len(positions),
+                   (positions + _FIRST_DATA_ROW).tolist()]
+        for column in present:
+            values = df[column].astype(object).where(df[column].notna(), None).to_numpy()
+            columns.append(values[positions].tolist())
+        rows = list(zip(*columns))
+
+        with self._connect() as conn:
+            conn.execute('DELETE FROM certificates WHERE source = ?', (source,))
+            conn.executemany(
+                f'INSERT INTO certificates ({", ".join(names)}) '
+                f'VALUES ({", ".join("?" * len(names))})',
+                rows,
+            )
+            conn.execute('INSERT OR REPLACE INTO sources (source, rows, certificates, indexed_at) '
+                         'VALUES (?, ?, ?, ?)', (source, len(df), len(rows), time.time()))
+        return len(rows)
+
+    def remove_source(self, source):
+        """Retire les lignes d'une source de l'index."""
+        with self._connect() as conn:
+            conn.execute('DELETE FROM certificates WHERE source = ?', (source,))
+            conn.execute('DELETE FROM sources WHERE source = ?', (source,))
+
+    def lookup(self, certificates):
+        """
+        Occurrences des certificats demandés (un numéro ou une liste ; les
+        saisies comme "GIA 1234567" sont acceptées). Retourne un DataFrame
+        trié par certificat, source et ligne.
+        """
+        if isinstance(certificates, (str, int, float)):
+            certificates = [certificates]
+        numbers = list(dict.fromkeys(
+            number for number in map(normalize_certificate, certificates) if number is not None))
+        columns = ['certificate', 'source', 'row'] + list(INDEX_ATTRIBUTES.values())
+        records = []
+        with self._connect() as conn:
+            for start in range(0, len(numbers), _LOOKUP_CHUNK):
+                chunk = numbers[start:start + _LOOKUP_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                records.extend(conn.execute(
+                    f'SELECT {", ".join(columns)} FROM certificates '
+                    f'WHERE certificate IN ({placeholders})', chunk))
+        frame = pd.DataFrame(records, columns=columns)
+        return frame.sort_values(['certificate', 'source', 'row'], kind='stable', ignore_index=True)
+
+    def duplicates(self, across_sources=False, limit=None):
+        """
+        Certificats présents plusieurs fois : nombre d'occurrences et de
+        sources distinctes, du plus fréquent au moins fréquent. Avec
+        `across_sources`, seuls ceux présents dans au moins deux sources.
+        """
+        having = 'COUNT(DISTINCT source) > 1' if across_sources else 'COUNT(*) > 1'
+        query = (f'SELECT certificate, COUNT(*) AS occurrences, COUNT(DISTINCT source) AS sources '
+                 f'FROM certificates GROUP BY certificate HAVING {having} '
+                 f'ORDER BY occurrences DESC, certificate')
+        parameters = ()
+        if limit is not None:
+            query += ' LIMIT ?'
+            parameters = (int(limit),)
+        with self._connect() as conn:
+            records = conn.execute(query, parameters).fetchall()
+        return pd.DataFrame(records, columns=['certificate', 'occurrences', 'sources'])
+
+    def sources(self):
+        """Sources indexées : lignes, certificats indexés et date d'indexation."""
+        with self._connect() as conn:
+            records = conn.execute('SELECT source, rows, certificates, indexed_at FROM sources '
+                                   'ORDER BY source').fetchall()
+        frame = pd.DataFrame(records, columns=['source', 'rows', 'certificates', 'indexed_at'])
+        frame['indexed_at'] = pd.to_datetime(frame['indexed_at'], unit='s')
+        return frame
+
+def read_processed_file(path, sheet_name=0):
+    """
+    Colonnes utiles à l'index d'un fichier traité (.xlsx, .csv ou .parquet),
+    lues sans conversion (les certificats restent des chaînes).
+    """
+    wanted = {CERTIFICATE_COLUMN, *INDEX_ATTRIBUTES}
+    suffix = Path(path).suffix.lower()
+    if suffix == '.csv':
+        return pd.read_csv(path, usecols=lambda column: column in wanted,
+                           dtype={CERTIFICATE_COLUMN: str})
+    if suffix == '.parquet':
+        frame = pd.read_parquet(path)
+        return frame[[column for column in frame.columns if column in wanted]]
+    return pd.read_excel(path, sheet_name=sheet_name, usecols=lambda column: column in wanted,
+                         dtype={CERTIFICATE_COLUMN: str})
+
+def index_file(index, path, sheet_name=0):
+    """
+    Indexe un fichier traité sous son chemin absolu. Retourne le nombre de
+    certificats indexés.
+    """
+    return index.add_frame(read_processed_file(path, sheet_name), os.path.abspath(path))
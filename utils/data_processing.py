@@ -1,27 +1,203 @@
-def process_data(df, mappings):
+"""
+Moteur de classification des fichiers Trade : applique les extracteurs
+sur la colonne 'Description of the goods' et calcule les poids dérivés.
+
+Aucune dépendance à Streamlit, pour pouvoir être utilisé en batch.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.extractors import (
+    extracting_clarity,
+    extract_color,
+    extract_shape,
+    scan_dimensions,
+    extract_pcs_carat,
+    extract_gia_number,
+    parse_pcs_carat_weight,
+)
+from utils.profiling import stage
+from utils.vectorized import DEFAULT_CHUNK_SIZE, DIMENSION_COLUMNS, extract_columns
+
+DESCRIPTION_COLUMN = 'Description of the goods'
+
+# 'vectorized' : extracteurs appliqués une fois par description distincte (utils.vectorized)
+# 'parallel' : idem, répartie sur plusieurs processus pour les gros fichiers
+# 'apply' : extracteurs appliqués ligne par ligne, implémentation de référence
+EXTRACTION_MODES = ('vectorized', 'parallel', 'apply')
+
+
+def calculate_pieces_per_carat_weight(quantity, pcs_per_carat):
+    """
+    Calcule le Pieces per Carat Weight basé sur Quantity * PCS/Carat
+    """
+    if quantity is None or pcs_per_carat is None:
+        return None
+    try:
+        # Convert to numeric values if they're not already
+        quantity = pd.to_numeric(quantity, errors='coerce')
+        pcs_per_carat = pd.to_numeric(pcs_per_carat, errors='coerce')
+
+        if pd.isna(quantity) or pd.isna(pcs_per_carat):
+            return None
+
+        return quantity * pcs_per_carat
+    except (TypeError, ValueError):
+        return None
+
+def calculate_average_weight(quantity, pieces_per_carat_weight):
+    """
+    Calcule le poids moyen (Average Weight) basé sur Quantity / Pieces per Carat Weight
+    """
+    if quantity is None or pieces_per_carat_weight is None or pieces_per_carat_weight == 0:
+        return None
+    try:
+        # Convert to numeric values if they're not already
+        quantity = pd.to_numeric(quantity, errors='coerce')
+        pieces_per_carat_weight = pd.to_numeric(pieces_per_carat_weight, errors='coerce')
+
+        if pd.isna(quantity) or pd.isna(pieces_per_carat_weight) or pieces_per_carat_weight == 0:
+            return None
+
+        return quantity / pieces_per_carat_weight
+    except (TypeError, ValueError, ZeroDivisionError):
+        return None
+
+def _weight_column(values, defined, index):
+    """
+    Colonne de poids : float64 si au moins une valeur est définie, sinon
+    colonne objet de None (comme le résultat de df.apply ligne par ligne).
+    """
+    if defined.any():
+        return pd.Series(values, index=index)
+    return pd.Series([None] * len(index), index=index, dtype=object)
+
+def compute_weights(df):
     """
-    Traite les données du fichier Trade+Search en fonction des mappings fournis.
+    Calcule 'Pieces per Carat Weight' (Quantity * PCS/Carat) et
+    'Average Weight' (Quantity / Pieces per Carat Weight) en une passe sur
+    des tableaux NumPy. Quantity et PCS/Carat sont convertis une seule fois ;
+    les valeurs manquantes et les divisions par zéro donnent des cases vides,
+    comme calculate_pieces_per_carat_weight / calculate_average_weight.
     """
-    shape_mapping = mappings["shape"]
-    color_mapping = mappings["color"]
-    clarity_mapping = mappings["clarity"]
+    if 'Quantity' in df.columns:
+        quantity = pd.to_numeric(df['Quantity'], errors='coerce').to_numpy(dtype=float)
+    else:
+        quantity = np.full(len(df), np.nan)
+    pcs_per_carat = pd.to_numeric(df['PCS/Carat'], errors='coerce').to_numpy(dtype=float)
 
-    # Ajouter une colonne vide pour Shape
-    df["Shape"] = "-"
-    
-    # Ajouter les autres colonnes nécessaires
-    df["Color"] = "-"
-    df["Clarity"] = "-"
-    df["PCS/Carat"] = "-"
-    df["PCS/Carat Weight"] = "-"
+    with np.errstate(invalid='ignore', over='ignore', divide='ignore'):
+        weight_defined = ~np.isnan(quantity) & ~np.isnan(pcs_per_carat)
+        weight = np.where(weight_defined, quantity * pcs_per_carat, np.nan)
 
-    # Exemple : Traiter Shape
-    shape_dict = dict(zip(shape_mapping["Shape Code"], shape_mapping["Shape"]))
-    for index, row in df.iterrows():
-        for shape_code, shape_name in shape_dict.items():
-            if shape_code.lower() in row["Description of the goods"].lower():
-                df.at[index, "Shape"] = shape_name.capitalize()
+        average_defined = weight_defined & ~np.isnan(weight) & (weight != 0)
+        average = np.divide(quantity, weight, out=np.full(len(df), np.nan), where=average_defined)
 
-    # Processus similaire pour Color, Clarity, PCS/Carat, etc.
+    return (_weight_column(weight, weight_defined, df.index),
+            _weight_column(average, average_defined, df.index))
+
+def classify_frame(df, mode='vectorized', cache=None, workers=None,
+                   chunk_size=DEFAULT_CHUNK_SIZE, executor=None):
+    """
+    Ajoute au DataFrame les colonnes extraites de la description
+    (Shape, Clarity, Color, Certi Number, dimensions, PCS/Carat) ainsi que
+    les poids calculés. Les dimensions comprennent leurs bornes numériques
+    (Length Min ... Height Max, en mm), à utiliser pour filtrer ou trier.
+    Retourne une copie, le DataFrame d'entrée n'est pas modifié.
+
+    `mode` choisit le moteur d'extraction (voir EXTRACTION_MODES) ; tous
+    produisent un résultat identique. Hors mode 'apply', les descriptions
+    sont dédoublonnées avant extraction et `cache` (DescriptionCache,
+    optionnel) est partagé entre les appels ; le taux de réutilisation est
+    disponible dans df.attrs['extraction_stats'].
+
+    En mode 'parallel', l'extraction est répartie sur `workers` processus
+    (None : nombre de cœurs) par blocs de `chunk_size` descriptions ; les
+    petits fichiers restent traités en série. `executor` : pool de processus
+    déjà démarré, réutilisé d'un appel à l'autre (voir extract_columns).
+    """
+    if DESCRIPTION_COLUMN not in df.columns:
+        raise KeyError(f"'{DESCRIPTION_COLUMN}' column not found")
+    if mode not in EXTRACTION_MODES:
+        raise ValueError(f"Unknown extraction mode: {mode!r}")
+
+    df = df.copy()
+
+    rows = len(df)
+    if mode in ('vectorized', 'parallel'):
+        with stage('extract', rows=rows):
+            extracted = extract_columns(
+                df[DESCRIPTION_COLUMN], cache=cache,
+                workers=workers if mode == 'parallel' else 1, chunk_size=chunk_size,
+                executor=executor if mode == 'parallel' else None)
+            for col in extracted.columns:
+                df[col] = extracted[col]
+        df.attrs['extraction_stats'] = extracted.attrs['extraction_stats']
+    else:
+        # Création et remplissage des colonnes extraites de la description
+        with stage('extract_shape', rows=rows):
+            df['Shape'] = df[DESCRIPTION_COLUMN].apply(extract_shape)
+        with stage('extracting_clarity', rows=rows):
+            df['Clarity'] = df[DESCRIPTION_COLUMN].apply(extracting_clarity)
+        with stage('extract_color', rows=rows):
+            df['Color'] = df[DESCRIPTION_COLUMN].apply(extract_color)
+        with stage('extract_gia_number', rows=rows):
+            df['Certi Number'] = df[DESCRIPTION_COLUMN].apply(extract_gia_number)
+
+        with stage('extract_dimensions', rows=rows):
+            dimensions_df = df[DESCRIPTION_COLUMN].apply(
+                lambda x: pd.Series(scan_dimensions(x), index=DIMENSION_COLUMNS))
+            for col in dimensions_df.columns:
+                df[col] = dimensions_df[col]
+
+        with stage('extract_pcs_carat', rows=rows):
+            df['PCS/Carat'] = df[DESCRIPTION_COLUMN].apply(extract_pcs_carat)
+
+    if mode != 'apply':
+        with stage('weights', rows=rows):
+            df['Pieces per Carat Weight'], df['Average Weight'] = compute_weights(df)
+    else:
+        with stage('weights', rows=rows):
+            # Calculer Pieces per Carat Weight = Quantity * PCS/Carat
+            df['Pieces per Carat Weight'] = df.apply(
+                lambda row: calculate_pieces_per_carat_weight(
+                    row.get('Quantity'),
+                    parse_pcs_carat_weight(row.get('PCS/Carat'))
+                ),
+                axis=1
+            )
+
+            # Calculer le poids moyen (Average Weight = Quantity / Pieces per Carat Weight)
+            df['Average Weight'] = df.apply(
+                lambda row: calculate_average_weight(row.get('Quantity'), row.get('Pieces per Carat Weight')),
+                axis=1
+            )
+
+    df['Height'] = df['Height'].combine_first(df['Depth'])
+    df.drop(columns=['Depth'], inplace=True)
+
+    # Height en chaîne comme MM Range (valeur ou plage "min-max", vide si
+    # absente ; les bornes numériques sont dans Height Min / Height Max)
+    df['Height'] = df['Height'].map(str, na_action='ignore')
 
     return df
+
+def process_data(df, mappings=None):
+    """
+    Ancien point d'entrée, conservé pour compatibilité : équivaut à
+    classify_frame(df). `mappings` (tables de codes de la première version)
+    est ignoré, les tables sont désormais dans utils.extractors.
+    """
+    return classify_frame(df)
+
+def load_data(uploaded_file, cache=None):
+    """
+    Charge un fichier Excel ou CSV et retourne le DataFrame classifié.
+    """
+    name = getattr(uploaded_file, 'name', str(uploaded_file))
+    if name.lower().endswith('.csv'):
+        df = pd.read_csv(uploaded_file)
+    else:
+        df = pd.read_excel(uploaded_file)
+    return classify_frame(df, cache=cache)
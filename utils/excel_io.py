@@ -0,0 +1,327 @@
+# utils/excel_io.py
+"""
+Lecture en flux des classeurs Excel avec openpyxl en mode read_only, et
+export en mémoire (XLSX, CSV, Parquet).
+
+Les lignes sont lues avec iter_rows et regroupées en lots de `batch_size`
+lignes, classifiés au fur et à mesure : la mémoire utilisée pendant la
+lecture dépend de la taille des lots et non de celle du fichier.
+
+Les exports sont écrits dans un BytesIO et retournés sous forme d'octets,
+sans fichier intermédiaire sur le disque.
+"""
+
+import io
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+
+from utils.data_processing import DESCRIPTION_COLUMN, classify_frame
+from utils.incremental import classify_frame_incremental
+from utils.profiling import record_stage, stage
+from utils.vectorized import merge_extraction_stats, process_pool
+
+DEFAULT_BATCH_SIZE = 10_000
+
+# Nombre de lignes parcourues pour trouver la ligne d'en-tête
+HEADER_SEARCH_ROWS = 50
+
+# Colonnes ajoutées en tête des lignes lues de plusieurs fichiers ou feuilles
+SOURCE_FILE_COLUMN = 'Source File'
+SOURCE_SHEET_COLUMN = 'Sheet'
+SOURCE_COLUMNS = [SOURCE_FILE_COLUMN, SOURCE_SHEET_COLUMN]
+
+# Format d'export -> (extension, type MIME)
+EXPORT_FORMATS = {
+    'xlsx': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'csv': ('csv', 'text/csv'),
+    'parquet': ('parquet', 'application/vnd.apache.parquet'),
+}
+
+
+def _rewind(source):
+    """Revient au début d'un fichier déjà lu (fichier uploadé, BytesIO)."""
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+def _open_workbook(source):
+    _rewind(source)
+    return load_workbook(source, read_only=True, data_only=True)
+
+def list_sheets(source):
+    """
+    Retourne la liste des feuilles du classeur.
+    """
+    workbook = _open_workbook(source)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+def sheet_row_counts(source):
+    """
+    Nombre de lignes de chaque feuille de calcul annoncé par le fichier
+    (en-tête compris, None s'il n'est pas renseigné), dans l'ordre du
+    classeur. Les feuilles de graphique sont ignorées.
+    """
+    workbook = _open_workbook(source)
+    try:
+        return {sheet.title: sheet.max_row for sheet in workbook.worksheets}
+    finally:
+        workbook.close()
+
+def tag_source(df, file_name, sheet_name):
+    """Ajoute en tête de `df` le fichier et la feuille d'origine des lignes."""
+    df.insert(0, SOURCE_SHEET_COLUMN, sheet_name)
+    df.insert(0, SOURCE_FILE_COLUMN, file_name)
+    return df
+
+def _convert_cell(value):
+    """
+    Convertit une cellule comme pd.read_excel : cellule vide -> None,
+    nombre entier stocké en flottant -> int.
+    """
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value == '':
+        return None
+    return value
+
+def _header_names(row):
+    """
+    Noms de colonnes à partir de la ligne d'en-tête, comme pd.read_excel :
+    cellule vide -> 'Unnamed: i', doublons suffixés par '.1', '.2'...
+    """
+    names = []
+    seen = {}
+    for i, value in enumerate(row):
+        name = f"Unnamed: {i}" if value is None else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+def _trim(row):
+    """Supprime les cellules vides en fin de ligne."""
+    end = len(row)
+    while end and row[end - 1] is None:
+        end -= 1
+    return row[:end]
+
+def _batch_frame(batch, header, start):
+    """
+    DataFrame d'un lot, indexé à partir de `start`. Les colonnes entièrement
+    vides sont en float (NaN), comme avec pd.read_excel ; les types sont
+    déduits lot par lot.
+    """
+    frame = pd.DataFrame(batch, columns=header, index=pd.RangeIndex(start, start + len(batch)))
+    for column in frame.columns[frame.isna().all().to_numpy()]:
+        frame[column] = np.nan
+    return frame
+
+def iter_excel_batches(source, sheet_name=None, batch_size=DEFAULT_BATCH_SIZE,
+                       header_column=DESCRIPTION_COLUMN, on_total=None):
+    """
+    Lit une feuille en flux et produit des DataFrames de `batch_size` lignes
+    au plus, avec un index continu d'un lot à l'autre.
+
+    La ligne d'en-tête est la première, parmi les HEADER_SEARCH_ROWS
+    premières, qui contient `header_column`.
+    `sheet_name` : nom de la feuille (None : feuille active).
+    `on_total(rows)` est appelé une fois l'en-tête trouvé avec le nombre de
+    lignes de données annoncé par le fichier (None s'il n'est pas renseigné) :
+    une estimation, utile pour une barre de progression.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+
+    workbook = _open_workbook(source)
+    try:
+        sheet = workbook[sheet_name] if sheet_name is not None else workbook.active
+        declared_rows = sheet.max_row
+        # Les dimensions enregistrées dans le fichier peuvent être fausses
+        sheet.reset_dimensions()
+        rows = sheet.iter_rows(values_only=True)
+
+        header = None
+        for row_number, row in enumerate(rows):
+            row = _trim([_convert_cell(value) for value in row])
+            if header_column in (str(value).strip() for value in row if value is not None):
+                header = _header_names(row)
+                break
+            if row_number + 1 >= HEADER_SEARCH_ROWS:
+                break
+        if header is None:
+            raise KeyError(f"'{header_column}' column not found")
+        header = [name.strip() if name.strip() == header_column else name for name in header]
+        width = len(header)
+        if on_total is not None:
+            on_total(max(declared_rows - row_number - 1, 0) if declared_rows else None)
+
+        batch = []
+        start = 0
+        # Les lignes vides ne sont conservées que si une ligne non vide
+        # les suit (pd.read_excel ignore les lignes vides en fin de feuille)
+        blank_rows = 0
+        for row in rows:
+            row = _trim([_convert_cell(value) for value in row])
+            if not row:
+                blank_rows += 1
+                continue
+            if len(row) < width:
+                row = row + [None] * (width - len(row))
+            pending = [[None] * width] * blank_rows + [row[:width]]
+            blank_rows = 0
+            for pending_row in pending:
+                batch.append(pending_row)
+                if len(batch) >= batch_size:
+                    yield _batch_frame(batch, header, start)
+                    start += len(batch)
+                    batch = []
+        if batch or start == 0:
+            # Feuille sans données : un lot vide garde les colonnes d'en-tête
+            yield _batch_frame(batch, header, start)
+    finally:
+        workbook.close()
+
+def iter_classified_batches(source, sheet_name=None, batch_size=DEFAULT_BATCH_SIZE,
+                            store=None, on_total=None, **classify_options):
+    """
+    Lit la feuille en flux et classifie chaque lot dès qu'il est lu.
+    `classify_options` est transmis à classify_frame (mode, cache, workers...).
+    Avec un ResultStore (`store`), seules les lignes absentes de la base sont
+    traitées. `on_total` : voir iter_excel_batches.
+
+    En mode 'parallel', un seul pool de processus est démarré pour toute la
+    lecture et reçoit les descriptions distinctes de chaque lot : les lots
+    sont trop petits pour amortir un pool par appel (PARALLEL_MIN_ROWS).
+    Un pool fourni par l'appelant (`executor`) est utilisé tel quel.
+    """
+    if classify_options.get('mode') == 'parallel' and classify_options.get('executor') is None:
+        workers = classify_options.get('workers') or os.cpu_count() or 1
+        if workers > 1:
+            with process_pool(workers) as executor:
+                yield from iter_classified_batches(source, sheet_name=sheet_name, batch_size=batch_size,
+                                                   store=store, on_total=on_total,
+                                                   **{**classify_options, 'executor': executor})
+            return
+
+    batches = iter_excel_batches(source, sheet_name=sheet_name, batch_size=batch_size,
+                                 on_total=on_total)
+    while True:
+        start = time.perf_counter()
+        batch = next(batches, None)
+        if batch is None:
+            break
+        record_stage('read_excel', time.perf_counter() - start, rows=len(batch))
+        if store is not None:
+            yield classify_frame_incremental(batch, store, **classify_options)
+        else:
+            yield classify_frame(batch, **classify_options)
+
+def read_classified_excel(source, sheet_name=None, batch_size=DEFAULT_BATCH_SIZE,
+                          on_batch=None, **classify_options):
+    """
+    Lit et classifie toute la feuille lot par lot, puis assemble le résultat.
+    `on_batch(rows)` est appelé après chaque lot avec le nombre de lignes
+    traitées jusque-là (barre de progression, par exemple).
+    """
+    results = []
+    rows = 0
+    for result in iter_classified_batches(source, sheet_name=sheet_name,
+                                          batch_size=batch_size, **classify_options):
+        results.append(result)
+        rows += len(result)
+        if on_batch is not None:
+            on_batch(rows)
+
+    return assemble_batches(results)
+
+def assemble_batches(results):
+    """
+    Assemble les lots classifiés (dans l'ordre de lecture) en un seul
+    tableau indexé à partir de 0, avec les statistiques d'extraction et de
+    reprise cumulées. Les lots peuvent venir de plusieurs feuilles : les
+    colonnes absentes d'une feuille y sont vides.
+    """
+    if len(results) > 1:
+        # Une colonne vide dans un lot y reste en object : on refait
+        # l'inférence des types sur le résultat complet
+        df = pd.concat(results, ignore_index=True).infer_objects()
+    else:
+        df = results[0]
+    stats = [result.attrs['extraction_stats']
+             for result in results if 'extraction_stats' in result.attrs]
+    if stats:
+        df.attrs['extraction_stats'] = merge_extraction_stats(stats)
+    incremental = [result.attrs['incremental_stats']
+                   for result in results if 'incremental_stats' in result.attrs]
+    if incremental:
+        df.attrs['incremental_stats'] = {key: sum(counts[key] for counts in incremental)
+                                         for key in ('rows', 'reused', 'processed')}
+    return df
+
+def _cell_values(df):
+    """
+    Lignes du DataFrame sous forme de tuples Python, valeurs manquantes -> None.
+    Les colonnes float32 (schéma compact) passent en float64 par leur
+    écriture décimale la plus courte : 3.48 reste 3.48 dans la cellule.
+    """
+    df = df.copy()
+    for column in df.columns:
+        if df[column].dtype in (np.float32, pd.Float32Dtype()):
+            df[column] = pd.to_numeric(df[column].astype(str), errors='coerce')
+    values = df.astype(object).where(df.notna(), None)
+    return values.itertuples(index=False, name=None)
+
+def to_xlsx_bytes(df, sheet_name='Sheet1'):
+    """
+    Export XLSX avec un classeur openpyxl en mode write_only : les lignes
+    sont écrites au fil de l'eau, sans garder les cellules en mémoire.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    sheet.append([str(column) for column in df.columns])
+    for row in _cell_values(df):
+        sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+def to_csv_bytes(df):
+    """Export CSV (UTF-8)."""
+    return df.to_csv(index=False).encode('utf-8')
+
+def to_parquet_bytes(df):
+    """
+    Export Parquet (nécessite pyarrow). Les colonnes object, qui peuvent
+    mélanger chaînes et nombres, sont écrites en texte, de même que les
+    valeurs des colonnes category de ce type.
+    """
+    df = df.copy()
+    for column in df.columns:
+        dtype = df[column].dtype
+        if isinstance(dtype, pd.CategoricalDtype) and dtype.categories.dtype == object:
+            df[column] = df[column].astype(object)
+        if df[column].dtype == object:
+            df[column] = df[column].where(df[column].isna(), df[column].astype(str)).astype('string')
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+def export_bytes(df, export_format):
+    """
+    Exporte le DataFrame dans un des formats de EXPORT_FORMATS et retourne
+    les octets du fichier.
+    """
+    writers = {'xlsx': to_xlsx_bytes, 'csv': to_csv_bytes, 'parquet': to_parquet_bytes}
+    if export_format not in writers:
+        raise ValueError(f"Unknown export format: {export_format!r}")
+    with stage(f'export_{export_format}', rows=len(df)):
+        return writers[export_format](df)
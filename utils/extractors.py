@@ -0,0 +1,806 @@
+# utils/extractors.py
+
+"""
+Extracteurs d'attributs (forme, clarté, couleur, dimensions, PCS/Carat, GIA)
+à partir de la colonne 'Description of the goods'.
+
+Ce module ne dépend pas de Streamlit : il peut être importé par les scripts
+batch, les workers ou les benchmarks sans charger l'interface.
+"""
+
+import re
+
+# Mapping data
+SHAPE_MAPPING = {
+    'RB': 'Round Brilliant Cut',
+    'RD': 'Round Brilliant Cut',
+    'BR': 'Round Brilliant Cut',
+    'BRT': 'Round Brilliant Cut',
+    'RBC': 'Round Brilliant Cut',
+    'PR': 'Princess Cut',
+    'PC': 'Princess Cut',
+    'PRC': 'Princess Cut',
+    'EM': 'Emerald Cut',
+    'EC': 'Emerald Cut',
+    'EMC': 'Emerald Cut',
+    'AS': 'Asscher Cut',
+    'ASC': 'Asscher Cut',
+    'CU': 'Cushion Cut',
+    'CUC': 'Cushion Cut',
+    'CUSH': 'Cushion Cut',
+    'MQ': 'Marquise Cut',
+    'MQB': 'Marquise Cut',
+    'MAR': 'Marquise Cut',
+    'OV': 'Oval Cut',
+    'OVC': 'Oval Cut',
+    'PE': 'Pear Cut',
+    'PS': 'Pear Cut',
+    'PEC': 'Pear Cut',
+    'HS': 'Heart Cut',
+    'HT': 'Heart Cut',
+    'HSC': 'Heart Cut',
+    'RAD': 'Radiant Cut',
+    'RC': 'Radiant Cut',
+    'RDC': 'Radiant Cut'
+}
+
+# Sort clarity codes by length
+sorted_clarity_codes = ['FL', 'IF', 'VVS1', 'VVS2', 'VS1', 'VS2', 'SI1', 'SI2', 'I1', 'I2', 'I3']
+
+# Règles de la cascade de clarté, dans l'ordre de priorité d'origine.
+# Chaque règle : (étape, résultat, motifs). Un motif est un couple
+# (premiers caractères, suite) ; un premier caractère précédé de '\b'
+# exige une frontière de mot avant lui. Le résultat None indique une
+# règle dont la valeur est déterminée après coup (étapes 8 et 9).
+_CLARITY_NUMBERED_CODES = ['VVS1', 'VVS2', 'VS1', 'VS2', 'SI1', 'SI2', 'I1', 'I2', 'I3']
+
+def _build_clarity_rules():
+    rules = []
+    # 1. Correspondance exacte avec les codes standards
+    for code in sorted_clarity_codes:
+        rules.append((1, code, [(r'\b' + code[0], code[1:] + r'\b')]))
+    # 2. Clarté suivie directement par un nombre (ex: "SI2105"). La première
+    # occurrence l'emporte, quel que soit le code.
+    for code in ['SI1', 'SI2', 'VS1', 'VS2', 'VVS1', 'VVS2', 'I1', 'I2', 'I3']:
+        rules.append((2, code, [(code[0], code[1:] + r'\d')]))
+    # 3. Espaces entre lettres et chiffres
+    for code in _CLARITY_NUMBERED_CODES:
+        rules.append((3, code, [(r'\b' + code[0], code[1:-1] + r'\s*' + code[-1] + r'\b')]))
+    # 4. Variantes avec tirets ou points
+    for code in _CLARITY_NUMBERED_CODES:
+        rules.append((4, code, [(r'\b' + code[0], code[1:-1] + r'[-.]' + code[-1] + r'\b')]))
+    # 5. Codes suivis d'un slash ou entre parenthèses
+    for code in _CLARITY_NUMBERED_CODES:
+        rules.append((5, code, [(r'\b' + code[0], code[1:] + '/'), (r'\(', code + r'\)')]))
+    # 6. Notations textuelles
+    rules.append((6, 'FL', [(r'\bF', r'LAWLESS\b')]))
+    rules.append((6, 'IF', [(r'\bI', r'NTERNALLY\s*FLAWLESS\b')]))
+    rules.append((6, 'IF', [(r'\bI', r'F\b')]))
+    # 7. Clarté générique sans numéro
+    for code in ('VVS', 'VS', 'SI'):
+        rules.append((7, code, [(r'\b' + code[0], code[1:] + r'\b')]))
+    # 8. Indicateurs explicites ("CLARITY:", "CL:", "CLAR:")
+    for indicator in ('CLARITY', 'CL', 'CLAR'):
+        rules.append((8, None, [('C', indicator[1:] + r'\s*[:=]\s*(?P<value>[A-Z0-9]{1,4})')]))
+    # 9. Séquence couleur/clarté (ex: "F/VVS2", "G VS1", "H-SI1")
+    rules.append((9, None, [(letter, r'[-\s/](?P<value>[A-Z]{1,3}[-\s]?[0-9]?)')
+                            for letter in 'DEFGHIJKLMNOPQRSTUVWXYZ']))
+    # 10. Recherche permissive par sous-chaîne
+    for part in ['FL', 'IF', 'VVS', 'VS', 'SI', 'I']:
+        rules.append((10, part + '1', [(part[0], part[1:] + ' ?1')]))
+        rules.append((10, part + '2', [(part[0], part[1:] + ' ?2')]))
+        rules.append((10, part + '3', [(part[0], part[1:] + (' ?3' if part == 'I' else '3'))]))
+    return rules
+
+_CLARITY_RULES = _build_clarity_rules()
+
+def _compile_clarity_matcher(rules):
+    """
+    Compile toutes les règles en une seule alternative. Les branches sont
+    regroupées par premier caractère : seul ce caractère est consommé, la
+    suite est testée dans un lookahead pour voir aussi les correspondances
+    qui se chevauchent, et le moteur écarte un groupe sur un seul test.
+
+    Dans chaque groupe, les branches restent dans l'ordre de priorité : à
+    une position donnée, la première branche qui correspond est donc la
+    règle la plus prioritaire. Chaque
+    branche se termine par un groupe vide nommé r<règle>_<n>, qui permet de
+    retrouver la règle via match.lastgroup.
+    """
+    groups = {}
+    for index, (_, _, patterns) in enumerate(rules):
+        for first, rest in patterns:
+            boundary = first.startswith(r'\b')
+            char = first[2:] if boundary else first
+            groups.setdefault(char, []).append((index, boundary, rest))
+
+    alternatives = []
+    value_groups = {}
+    n = 0
+    for char, branches in groups.items():
+        parts = []
+        for index, boundary, rest in branches:
+            n += 1
+            marker = f'r{index}_{n}'
+            if '(?P<value>' in rest:
+                value_groups[marker] = f'v{index}_{n}'
+                rest = rest.replace('(?P<value>', f'(?P<v{index}_{n}>')
+            if boundary and rest[0].isalnum():
+                # Frontière de mot avant le premier caractère, vérifiée après
+                # le deuxième pour que la branche commence par un littéral
+                rest = rest[0] + r'(?<!\w..)' + rest[1:]
+            elif boundary:
+                rest = r'(?<!\w.)' + rest
+            parts.append(f'{rest}(?P<{marker}>)')
+        alternatives.append(char + '(?=' + '|'.join(parts) + ')')
+    return re.compile('|'.join(alternatives)), value_groups
+
+_CLARITY_MATCHER, _CLARITY_VALUE_GROUPS = _compile_clarity_matcher(_CLARITY_RULES)
+
+def _match_clarity_code(extracted):
+    """
+    Normalise une valeur extraite vers le premier code de clarté compatible.
+    """
+    for code in sorted_clarity_codes:
+        if code in extracted or extracted in code:
+            return code
+    return None
+
+def extracting_clarity(description):
+    """
+    Extrait la clarté à partir de la description avec une gestion exhaustive des cas.
+    Gère différentes notations, espaces, formats et variantes possibles.
+
+    Toutes les étapes de la cascade sont compilées en une seule expression :
+    la description n'est parcourue qu'une fois et la règle la plus
+    prioritaire l'emporte, avec le même résultat que la cascade d'origine.
+    """
+    if not description or not isinstance(description, str):
+        return None
+
+    return scan_clarity(description.upper().strip())
+
+def scan_clarity(description):
+    """
+    Applique le matcher de clarté à une description déjà en majuscules
+    et sans espaces en bordure.
+    """
+    return scan_clarity_stage(description)[0]
+
+def scan_clarity_stage(description):
+    """
+    Comme scan_clarity, mais retourne aussi l'étape de la cascade qui a
+    décidé : (clarté, étape), l'étape valant None si rien n'est trouvé.
+    """
+    best_rank = None
+    best_code = None
+    indicators = {}
+    color_clarity = None
+    for match in _CLARITY_MATCHER.finditer(description):
+        marker = match.lastgroup
+        index = int(marker[1:marker.index('_')])
+        stage, code, _ = _CLARITY_RULES[index]
+        if stage == 8:
+            # Seule la première occurrence de chaque indicateur compte
+            indicators.setdefault(index, match.group(_CLARITY_VALUE_GROUPS[marker]))
+        elif stage == 9:
+            if color_clarity is None:
+                color_clarity = match.group(_CLARITY_VALUE_GROUPS[marker])
+        else:
+            # Étape 2 : la première occurrence (la plus à gauche) l'emporte
+            rank = (stage, 0 if stage == 2 else index)
+            if best_rank is None or rank < best_rank:
+                best_rank, best_code = rank, code
+                if rank == (1, 0):
+                    break
+
+    if best_rank is not None and best_rank[0] <= 7:
+        return best_code, best_rank[0]
+
+    # 8. Indicateurs explicites, dans l'ordre des motifs
+    for index in sorted(indicators):
+        extracted = indicators[index]
+        if extracted in sorted_clarity_codes:
+            return extracted, 8
+        code = _match_clarity_code(extracted)
+        if code:
+            return code, 8
+
+    # 9. Séquence couleur/clarté : seule la première occurrence est examinée
+    if color_clarity is not None:
+        code = _match_clarity_code(color_clarity.replace(' ', '').replace('-', ''))
+        if code:
+            return code, 9
+
+    # 10. Recherche permissive
+    if best_rank is not None:
+        return best_code, 10
+
+    # 11. Aucune clarté trouvée
+    return None, None
+
+COLOR_PATTERN = re.compile(r'(?<![A-Z0-9])(WHITE|D|E|F|G|H|I|J|K|L|M|EVS1)(?![A-Z0-9])')
+
+def extract_color(description):
+    """
+    Extrait la couleur à partir de la description.
+    """
+    description = str(description).upper()
+    if "WH" in description:
+        return "White"
+    if "D/CUT" in description:
+        description = description.replace("D/CUT", "")
+
+    color_match = COLOR_PATTERN.findall(description)
+    for match in color_match:
+        if match == "WHITE":
+            return "White"
+        elif match == "EVS1":
+            return "E"
+        else:
+            return match.capitalize()
+    return "UNKNOWN"
+
+# Codes de forme, ordonnés par priorité (plus spécifique en premier)
+SHAPE_PRIORITY_MAPPING = [
+    ('RBC', 'Round Brilliant Cut'),
+    ('RB', 'Round Brilliant Cut'),
+    ('RD', 'Round Brilliant Cut'),
+    ('BRT', 'Round Brilliant Cut'),
+    ('BR', 'Round Brilliant Cut'),
+    ('PRC', 'Princess Cut'),
+    ('PR', 'Princess Cut'),
+    ('EMC', 'Emerald Cut'),
+    ('EM', 'Emerald Cut'),
+    ('EC', 'Emerald Cut'),
+    ('ASC', 'Asscher Cut'),
+    ('AS', 'Asscher Cut'),
+    ('CUC', 'Cushion Cut'),
+    ('CUSH', 'Cushion Cut'),
+    ('CU', 'Cushion Cut'),
+    ('MQB', 'Marquise Cut'),
+    ('MQ', 'Marquise Cut'),
+    ('MAR', 'Marquise Cut'),
+    ('OVC', 'Oval Cut'),
+    ('OV', 'Oval Cut'),
+    ('PEC', 'Pear Cut'),
+    ('PE', 'Pear Cut'),
+    ('PS', 'Pear Cut'),
+    ('HSC', 'Heart Cut'),
+    ('HS', 'Heart Cut'),
+    ('HT', 'Heart Cut'),
+    ('RDC', 'Radiant Cut'),
+    ('RAD', 'Radiant Cut'),
+    ('RC', 'Radiant Cut')
+]
+
+# Mots complets, testés avant les codes (priorité absolue)
+SHAPE_KEYWORDS = [
+    ('EMERALD', 'Emerald Cut'),
+    ('PRINCESS', 'Princess Cut'),
+    ('CUSHION', 'Cushion Cut'),
+    ('MARQUISE', 'Marquise Cut'),
+    ('OVAL', 'Oval Cut'),
+    ('PEAR', 'Pear Cut'),
+    ('HEART', 'Heart Cut'),
+    ('ASSCHER', 'Asscher Cut'),
+    ('RADIANT', 'Radiant Cut')
+]
+
+def _compile_shape_matcher():
+    """
+    Compile les mots complets et les codes de forme en une seule alternative,
+    dans l'ordre de priorité. Le motif est un lookahead testé à chaque
+    position : findall retourne tous les jetons, même ceux qui se
+    chevauchent, en un seul passage sur la description. Un premier test sur
+    l'initiale des jetons écarte rapidement les autres positions.
+
+    Rang de chaque jeton : ROUND, puis RECTANGULAR (Radiant Cut si MODIFIED
+    BRILLIANT est présent, sinon Emerald Cut), puis SHAPE_KEYWORDS et enfin
+    les codes de SHAPE_PRIORITY_MAPPING. "PC <chiffre>" (pièce) est repéré
+    pour écarter le code PC.
+    """
+    shapes = [('ROUND', 'Round Brilliant Cut'), ('RECTANGULAR', None)] + SHAPE_KEYWORDS
+    ranks = {keyword: (rank, keyword, shape) for rank, (keyword, shape) in enumerate(shapes)}
+    for rank, (code, shape) in enumerate(SHAPE_PRIORITY_MAPPING, start=len(shapes)):
+        ranks.setdefault(code, (rank, code, shape))
+    alternatives = [re.escape(keyword) for keyword, _ in shapes] + [
+        'MODIFIED BRILLIANT',
+        r'\bPC\s+\d+\b',
+        r'\b(?:' + '|'.join(re.escape(code) for code, _ in SHAPE_PRIORITY_MAPPING) + r')\b',
+    ]
+    initials = sorted({token[0] for token in list(ranks) + ['MODIFIED BRILLIANT', 'PC']})
+    pattern = '(?=[' + ''.join(initials) + '])(?=(' + '|'.join(alternatives) + '))'
+    return re.compile(pattern), ranks, len(shapes)
+
+SHAPE_MATCHER, _SHAPE_TOKEN_RANKS, _SHAPE_KEYWORD_COUNT = _compile_shape_matcher()
+
+def shape_from_tokens(tokens):
+    """
+    Forme retenue parmi les jetons trouvés par SHAPE_MATCHER :
+    (forme, 'keyword' | 'code' | None).
+    """
+    best = None
+    modified_brilliant = False
+    pc_piece = False
+    for token in tokens:
+        entry = _SHAPE_TOKEN_RANKS.get(token)
+        if entry is None:
+            if token == 'MODIFIED BRILLIANT':
+                modified_brilliant = True
+            else:
+                pc_piece = True
+        elif best is None or entry[0] < best[0]:
+            best = entry
+    # Si "PC" est suivi d'un chiffre, c'est probablement "piece X", pas princess cut
+    if best is not None and best[1] == 'PC' and pc_piece:
+        best = min((_SHAPE_TOKEN_RANKS[token] for token in tokens
+                    if token in _SHAPE_TOKEN_RANKS and token != 'PC'), default=None)
+    if best is None:
+        return "N/A", None
+    rank, _, shape = best
+    if shape is None:
+        shape = "Radiant Cut" if modified_brilliant else "Emerald Cut"
+    return shape, 'keyword' if rank < _SHAPE_KEYWORD_COUNT else 'code'
+
+def extract_shape(description):
+    """
+    Extrait la forme à partir de la description avec priorité pour les mots complets.
+
+    Mots complets et codes sont cherchés en un seul passage (SHAPE_MATCHER),
+    avec le même résultat que la cascade d'origine.
+    """
+    if not isinstance(description, str):
+        return "N/A"
+    description_upper = description.upper()
+    # ROUND est prioritaire sur tout le reste : inutile de parcourir la description
+    if "ROUND" in description_upper:
+        return "Round Brilliant Cut"
+    return shape_from_tokens(SHAPE_MATCHER.findall(description_upper))[0]
+
+# Formats de dimensions, dans l'ordre de la cascade d'extract_dimensions
+DIM_PAREN_DASH = re.compile(r'\((\d+\.\d+)\s*-\s*(\d+\.\d+)\s*\*\s*(\d+\.\d+)\)')
+DIM_STAR = re.compile(r'\((\d+\.\d+)\s*\*\s*(\d+\.\d+)\s*\*\s*(\d+\.\d+)\)')
+DIM_D_H = re.compile(r'D\s*\(\s*(\d+\.\d+)\s*-\s*(\d+\.\d+)\s*\)\s*H\s*\(\s*(\d+\.\d+)\s*-\s*(\d+\.\d+)\s*\)')
+DIM_L_H = re.compile(r'L\((\d+\.\d+)-(\d+\.\d+)\)H\((\d+\.\d+)-(\d+\.\d+)\)')
+DIM_L_W_H = re.compile(r'L\(\s*(\d+\.\d+)-(\d+\.\d+)\)\s*W\(\s*(\d+\.\d+)-(\d+\.\d+)\)\s*H\(\s*(\d+\.\d+)-(\d+\.\d+)\)')
+DIM_DIA_MM = re.compile(r'DIA\s*MM\s*(\d+\.\d+)\s*-\s*(\d+\.\d+)')
+DIM_HEIGHT_MM = re.compile(r'HEIGHT\s*MM\s*(\d+\.\d+)\s*-\s*(\d+\.\d+)')
+DIM_SLASH = re.compile(r'(\d+\.\d+)\s*/\s*(\d+\.\d+)\s*/\s*(\d+\.\d+)')
+DIM_X = re.compile(r'(\d+\.\d+)X(\d+\.\d+)X(\d+\.\d+)')
+DIM_MM_RANGE = re.compile(r'(\d+\.\d+)\s*MM\s*-\s*(\d+\.\d+)\s*MM')
+DIM_SINGLE_MM = re.compile(r'(\d+\.\d+)\s*MM')
+DIM_PAREN_RANGE = re.compile(r'\((\d+\.\d+)\s*-\s*(\d+\.\d+)\)')
+DIM_SIMPLE_RANGE = re.compile(r'(\d+\.\d+)\s*-\s*(\d+\.\d+)')
+DIM_SIZE = re.compile(r'SIZE\s*:?\s*(\d+\.\d+)\s*-\s*(\d+\.\d+)\s*MM')
+DIM_MM_SIZE = re.compile(r'MM\s+SIZE\s*:?\s*(\d+\.\d+)\s*-\s*(\d+\.\d+)')
+DIM_MM_TO = re.compile(r'(\d+\.\d+)\s*MM\s+TO\s+(\d+\.\d+)\s*MM')
+DIM_NUMBER = re.compile(r'\b(\d+\.\d+)\b')
+
+# Bornes numériques des dimensions, en mm (valeur manquante si inconnue)
+DIMENSION_BOUND_COLUMNS = ['Length Min', 'Length Max', 'Width Min', 'Width Max',
+                           'Height Min', 'Height Max']
+
+# Résultat complet d'un format de dimensions : les 5 valeurs historiques
+# (Length, Width, Height, MM Range, Depth) suivies des 6 bornes numériques
+_NO_DIMENSIONS = (None,) * 11
+
+def dims_triple(length, width, height):
+    """Longueur, largeur et hauteur exactes."""
+    length, width, height = float(length), float(width), float(height)
+    return (length, width, height, f"{length}-{width}", None,
+            length, length, width, width, height, height)
+
+def dims_height_range(d_min, d_max, h_min, h_max):
+    """Plage de diamètre et plage de hauteur."""
+    d_min, d_max, h_min, h_max = float(d_min), float(d_max), float(h_min), float(h_max)
+    return (d_min, d_min, f"{h_min}-{h_max}", f"{d_min}-{d_max}", None,
+            d_min, d_max, d_min, d_max, h_min, h_max)
+
+def dims_lwh_range(l_min, l_max, w_min, w_max, h_min, h_max):
+    """Plages de longueur, de largeur et de hauteur (diamant non rond)."""
+    l_min, l_max, w_min, w_max = float(l_min), float(l_max), float(w_min), float(w_max)
+    h_min, h_max = float(h_min), float(h_max)
+    return (l_min, w_min, f"{h_min}-{h_max}", f"{l_min}-{l_max}", None,
+            l_min, l_max, w_min, w_max, h_min, h_max)
+
+def dims_dia(min_dia, max_dia, min_height=None, max_height=None):
+    """Plage de diamètre "DIA MM", avec une éventuelle plage "HEIGHT MM"."""
+    min_dia, max_dia = float(min_dia), float(max_dia)
+    if min_height is None:
+        height_range = h_min = h_max = None
+    else:
+        h_min, h_max = float(min_height), float(max_height)
+        height_range = f"{h_min}-{h_max}"
+    return (min_dia, min_dia, height_range, f"{min_dia}-{max_dia}", None,
+            min_dia, max_dia, min_dia, max_dia, h_min, h_max)
+
+def dims_range(min_dim, max_dim):
+    """Plage de taille (diamètre), sans hauteur."""
+    min_dim, max_dim = float(min_dim), float(max_dim)
+    return (min_dim, max_dim, None, f"{min_dim}-{max_dim}", None,
+            min_dim, max_dim, min_dim, max_dim, None, None)
+
+def dims_single(value):
+    """Taille unique, sans hauteur."""
+    value = float(value)
+    return (value, value, None, str(value), None,
+            value, value, value, value, None, None)
+
+def dims_numbers(numbers):
+    """Nombres décimaux isolés : trois ou plus (L, W, H), deux (plage) ou un seul."""
+    if len(numbers) >= 3:
+        return dims_triple(*numbers[:3])
+    if len(numbers) == 2:
+        return dims_range(*numbers)
+    if len(numbers) == 1:
+        return dims_single(numbers[0])
+    return _NO_DIMENSIONS
+
+def scan_dimensions(description):
+    """
+    Cascade d'extract_dimensions. Retourne les 5 valeurs historiques
+    (Length, Width, Height, MM Range, Depth) suivies des bornes numériques
+    de DIMENSION_BOUND_COLUMNS.
+    """
+    if not isinstance(description, str):
+        return _NO_DIMENSIONS
+
+    description = description.upper()
+
+    # 1. Format "(x.xx - y.yy * z.zz)"
+    paren_dash_match = DIM_PAREN_DASH.search(description)
+    if paren_dash_match:
+        return dims_triple(*paren_dash_match.groups())
+
+    # 2. Format "(x.xx * y.yy * z.zz)"
+    star_match = DIM_STAR.search(description)
+    if star_match:
+        return dims_triple(*star_match.groups())
+
+    # 3. Format "D (min-max) H(min-max)"
+    d_h_match = DIM_D_H.search(description)
+    if d_h_match:
+        return dims_height_range(*d_h_match.groups())
+
+    # 4. Format "L(1.50-1.85)H(0.90-1.25)"
+    lh_match = DIM_L_H.search(description)
+    if lh_match:
+        return dims_height_range(*lh_match.groups())
+
+    # 5. Format pour diamant non rond
+    pear_match = DIM_L_W_H.search(description)
+    if pear_match:
+        return dims_lwh_range(*pear_match.groups())
+
+    # 6. Format avec "DIA MM" et "HEIGHT MM"
+    dia_match = DIM_DIA_MM.search(description)
+    if dia_match:
+        height_match = DIM_HEIGHT_MM.search(description)
+        if height_match:
+            return dims_dia(*dia_match.groups(), *height_match.groups())
+        return dims_dia(*dia_match.groups())
+
+    # 7. Format pour cas comme "CPD MARQUISE /NON CERT /F /VVS2 /NC/5.4 /2.86 /1.68"
+    if '/NC' in description:
+        after_nc = description.split('/NC')[-1]
+        slash_match = DIM_SLASH.search(after_nc)
+        if slash_match:
+            return dims_triple(*slash_match.groups())
+
+    # 8. Autres formats avec slash
+    slash_match = DIM_SLASH.search(description)
+    if slash_match:
+        return dims_triple(*slash_match.groups())
+
+    # 9. Format avec "X" comme séparateur (e.g., 3.50X3.48X2.17)
+    x_match = DIM_X.search(description)
+    if x_match:
+        return dims_triple(*x_match.groups())
+
+    # 10. Format avec "MM" et chiffres (ex: "4.5MM - 4.8MM")
+    mm_range_match = DIM_MM_RANGE.search(description)
+    if mm_range_match:
+        return dims_range(*mm_range_match.groups())
+
+    # 11. Format avec juste "MM" (ex: "4.7MM")
+    single_mm_match = DIM_SINGLE_MM.search(description)
+    if single_mm_match:
+        return dims_single(single_mm_match.group(1))
+
+    # 12. Format avec dimensions entre parenthèses (ex: "(4.8-5.1)")
+    paren_dims = DIM_PAREN_RANGE.search(description)
+    if paren_dims:
+        return dims_range(*paren_dims.groups())
+
+    # 13. Format avec dimensions juste comme nombres séparés par "-" (ex: "4.8-5.1")
+    simple_dims = DIM_SIMPLE_RANGE.search(description)
+    if simple_dims:
+        return dims_range(*simple_dims.groups())
+
+    # 14. Format avec "SIZE" suivi de dimensions (ex: "SIZE:3.0-3.5MM")
+    size_match = DIM_SIZE.search(description)
+    if size_match:
+        return dims_range(*size_match.groups())
+
+    # 15. Format avec "MM SIZE" suivi de dimensions (ex: "MM SIZE: 1.70-2.00")
+    mm_size_match = DIM_MM_SIZE.search(description)
+    if mm_size_match:
+        return dims_range(*mm_size_match.groups())
+
+    # 16. Format avec MM suivi de TO (ex: "1.00MM TO 1.10MM")
+    mm_to_match = DIM_MM_TO.search(description)
+    if mm_to_match:
+        return dims_range(*mm_to_match.groups())
+
+    # 17. Recherche de nombres simples (au moins 3 chiffres avec décimale) :
+    # trois nombres ou plus pour L, W, H, deux pour la plage MM, un seul
+    # comme dimension unique
+    return dims_numbers(DIM_NUMBER.findall(description))
+
+def extract_dimensions(description):
+    """
+    Extrait les dimensions à partir de la description : Length, Width,
+    Height, MM Range, Depth. Les bornes numériques sont données par
+    extract_dimension_bounds.
+    """
+    return scan_dimensions(description)[:5]
+
+def extract_dimension_bounds(description):
+    """
+    Bornes numériques des dimensions (DIMENSION_BOUND_COLUMNS) : longueur,
+    largeur et hauteur minimales et maximales, en mm. Une dimension exacte
+    donne deux bornes égales ; une plage de taille sans précision donne les
+    mêmes bornes en longueur et en largeur.
+    """
+    return scan_dimensions(description)[5:]
+
+# Tous les formats de numéro GIA contiennent "GIA" : sans cette sous-chaîne,
+# inutile de parcourir la cascade
+GIA_TRIGGER = 'GIA'
+
+# Numéro GIA (les deux premiers formats d'extract_gia_number)
+GIA_PATTERN = re.compile(r'GIA[:\s]?[:]?\s*(\d{5,14})')
+GIA_DIRECT_PATTERN = re.compile(r'GIA(\d{5,14})')
+GIA_HYPHEN_PATTERN = re.compile(r'GIA[-_:#](\d{5,14})')
+GIA_NUMBER_PATTERN = re.compile(r'GIA\s*(?:N°|No\.|NUMBER)?\s*[:=]?\s*(\d{5,14})')
+
+# Formats PCS/Carat, dans l'ordre de la cascade d'extract_pcs_carat
+PCS_COUNT_PATTERNS = [re.compile(r'/PCS-\d+'), re.compile(r'\bPCS-\d+')]
+PCS_PC_END = re.compile(r'\bPC\s*(\d+\.?\d*)\s*$')
+PCS_PC_ANYWHERE = re.compile(r'\bPC\s*(\d+\.?\d*)\b')
+PCS_CTS_SPACE = re.compile(r'PCS/CTS\s*(\d+\.?\d*)')
+PCS_FRACTION = re.compile(r'(?:PCS/CTS|PCT/CT|PC/CT|P/CT)\s*(\d+)/(\d+)')
+PCS_CTS_PATTERNS = [
+    re.compile(r'P/?CTS\s*(\d+\.?\d*)'),
+    re.compile(r'PC/?CTS\s*(\d+\.?\d*)'),
+    re.compile(r'P/CT\s*(\d+\.?\d*)'),
+    re.compile(r'PC/CT\s*(\d+\.?\d*)'),
+    re.compile(r'PCS/CT\s*(\d+\.?\d*)'),
+    re.compile(r'P/C\s*(\d+\.?\d*)')
+]
+PCS_SPACE_BEFORE = re.compile(r'(\d+\.?\d*)\s+(?:P/?CTS|PC/?CTS|P/CT|PC/CT|PCS/CT|P/C)')
+PCS_ALT_PATTERNS = [
+    re.compile(r'P/?CTS[-:=](\d+\.?\d*)'),
+    re.compile(r'PC/?CTS[-:=](\d+\.?\d*)'),
+    re.compile(r'PCS/CT[-:=](\d+\.?\d*)'),
+    re.compile(r'(?:P|PC|PCS)/(?:CT|CTS)[-:=](\d+\.?\d*)')
+]
+PCS_STANDALONE = re.compile(r'(\d+\.?\d*)\s+PCS\b')
+PCS_EXPLICIT_PATTERNS = [
+    re.compile(r'(\d+\.?\d*)\s*PIECES?\s*(?:PER|/)\s*(?:CARAT|CT|CTS)'),
+    re.compile(r'(\d+\.?\d*)\s*PCS\s*(?:PER|/)\s*(?:CARAT|CT|CTS)'),
+    re.compile(r'(\d+\.?\d*)\s*P\s*(?:PER|/)\s*(?:CARAT|CT|CTS)'),
+    re.compile(r'(\d+\.?\d*)\s*/\s*(?:CARAT|CT|CTS)'),
+    re.compile(r'(\d+\.?\d*)\s*PC\s*/\s*(?:CARAT|CT|CTS)')
+]
+PCS_EXPLICIT_TERMS = ["PCS/CT", "PC/CT", "PCS/CARAT", "PC/CARAT", "PCS PER CARAT", "PC PER CARAT"]
+
+# Chaque format PCS/Carat contient au moins une de ces sous-chaînes ("PC",
+# "PI" de PIECES, "PER" de "P PER CARAT", ou un slash, seul déclencheur du
+# format "x/CT") : une description qui n'en contient aucune donne "N/A"
+PCS_TRIGGERS = ('/', 'PC', 'PI', 'PER')
+_PCS_NUMBER = re.compile(r'(\d+\.?\d*)')
+
+def unless_gia(value, gia_number):
+    """
+    Retourne "N/A" si la valeur trouvée est en fait le numéro GIA.
+    """
+    if gia_number and value == gia_number:
+        return "N/A"
+    return value
+
+def pcs_pc_anywhere(description, value, gia_number):
+    """
+    PC suivi d'un nombre ailleurs dans la description : retenu seulement
+    après GIA ou en fin de description. Retourne None pour continuer la cascade.
+    """
+    # Vérifier le contexte - si c'est après GIA ou en fin, c'est probablement PCS/Carat
+    pc_position = description.find(f"PC{value}") if f"PC{value}" in description else description.find(f"PC {value}")
+    gia_position = description.find("GIA") if "GIA" in description else -1
+
+    # Si PC vient après GIA ou est en fin de description, c'est probablement PCS/Carat
+    if gia_position != -1 and pc_position > gia_position:
+        return unless_gia(value, gia_number)
+    # Si PC est en fin de description (derniers 10 caractères)
+    elif pc_position >= len(description) - 10:
+        return unless_gia(value, gia_number)
+    return None
+
+def pcs_standalone(description, value, gia_number):
+    """
+    "X PCS" : valeur PCS/Carat seulement si une indication par carat est proche,
+    sinon c'est le nombre de pièces.
+    """
+    context = description[max(0, description.find(value) - 15):min(len(description), description.find(value) + 20)]
+    if "PER CARAT" in context or "P/CT" in context or "PC/CT" in context or "PCS/CT" in context:
+        # C'est bien une valeur PCS/Carat
+        return unless_gia(value, gia_number)
+    # C'est probablement juste le nombre de pièces, pas PCS/Carat
+    return "N/A"
+
+def pcs_near_terms(description, gia_number):
+    """
+    Cherche un nombre à proximité d'un terme explicite de PCS/Carat.
+    Retourne None si aucun n'est trouvé.
+    """
+    for term in PCS_EXPLICIT_TERMS:
+        if term in description:
+            # Identifier la position du terme
+            term_pos = description.find(term)
+            # Chercher un nombre dans les 10 caractères avant ou après ce terme
+            before_text = description[max(0, term_pos - 15):term_pos]
+            after_text = description[term_pos + len(term):min(len(description), term_pos + 15)]
+
+            before_match = _PCS_NUMBER.search(before_text)
+            after_match = _PCS_NUMBER.search(after_text)
+
+            if before_match:
+                value = before_match.group(1)
+                if gia_number and value == gia_number:
+                    continue
+                return value
+            if after_match:
+                value = after_match.group(1)
+                if gia_number and value == gia_number:
+                    continue
+                return value
+    return None
+
+def extract_pcs_carat(description):
+    """
+    Extrait la valeur PCS/Carat avec une gestion exhaustive des cas,
+    en évitant de capturer les numéros GIA et en distinguant le nombre de pièces
+    des valeurs PCS/Carat.
+    """
+    if not isinstance(description, str):
+        return "N/A"
+    description = description.upper()
+
+    # Aucun déclencheur : aucun format ne peut correspondre
+    if not any(trigger in description for trigger in PCS_TRIGGERS):
+        return "N/A"
+
+    # Vérifier si la description contient un numéro GIA
+    gia_match = None
+    if GIA_TRIGGER in description:
+        gia_match = GIA_PATTERN.search(description)
+        if not gia_match:
+            gia_match = GIA_DIRECT_PATTERN.search(description)
+    gia_number = gia_match.group(1) if gia_match else None
+
+    # Ne pas considérer "PCS-X" comme une valeur PCS/Carat, car cela indique le nombre de pièces
+    if any(pattern.search(description) for pattern in PCS_COUNT_PATTERNS):
+        return "N/A"
+
+    # **NOUVELLE CORRECTION** : Format "PC" suivi directement d'un chiffre ou avec espace
+    # Par exemple: "PC1" ou "PC 1" en fin de description (après GIA)
+    pc_number_match = PCS_PC_END.search(description)
+    if pc_number_match:
+        return unless_gia(pc_number_match.group(1), gia_number)
+
+    # Alternative: PC suivi d'un nombre n'importe où dans la description
+    # mais seulement si c'est clairement en contexte de pièces par carat
+    pc_anywhere_match = PCS_PC_ANYWHERE.search(description)
+    if pc_anywhere_match:
+        value = pcs_pc_anywhere(description, pc_anywhere_match.group(1), gia_number)
+        if value is not None:
+            return value
+
+    # **CORRECTION PRINCIPALE** : Format "PCS/CTS" suivi d'un espace et d'un nombre
+    # Par exemple: "PCS/CTS 6" ou "PCS/CTS20"
+    pcs_cts_space_match = PCS_CTS_SPACE.search(description)
+    if pcs_cts_space_match:
+        return unless_gia(pcs_cts_space_match.group(1), gia_number)
+
+    # Format fractionnel "PCS/CTS 40/1" ou "PCT/CT 40/1"
+    frac_match = PCS_FRACTION.search(description)
+    if frac_match:
+        return unless_gia(frac_match.group(1), gia_number)
+
+    # Format avec P/CTS ou PC/CTS suivi d'un nombre
+    for pattern in PCS_CTS_PATTERNS:
+        match = pattern.search(description)
+        if match:
+            return unless_gia(match.group(1), gia_number)
+
+    # Format avec espace entre le nombre et P/CTS
+    # Par exemple: "CPD ROUND WHITE SI1 59 P/CTS"
+    space_pattern = PCS_SPACE_BEFORE.search(description)
+    if space_pattern:
+        return unless_gia(space_pattern.group(1), gia_number)
+
+    # Format où le chiffre est séparé par des caractères différents
+    for pattern in PCS_ALT_PATTERNS:
+        match = pattern.search(description)
+        if match:
+            return unless_gia(match.group(1), gia_number)
+
+    # Format avec juste "PCS" après un nombre (sans /CTS ou /CARAT)
+    # Par exemple: "CPD ROUND WHITE SI 2 62 PCS"
+    # ATTENTION: Ici, on doit distinguer "X PCS" (nombre de pièces) de "X PCS/CT" (pièces par carat)
+    standalone_pcs_pattern = PCS_STANDALONE.search(description)
+    if standalone_pcs_pattern:
+        return pcs_standalone(description, standalone_pcs_pattern.group(1), gia_number)
+
+    # Recherche contextuelle - trouve les chiffres près des mentions explicites de carats
+    # On cherche uniquement les formats qui indiquent clairement "par carat" ou "per carat"
+    for pattern in PCS_EXPLICIT_PATTERNS:
+        match = pattern.search(description)
+        if match:
+            return unless_gia(match.group(1), gia_number)
+
+    # Si nous avons des termes explicites de PCS/Carat dans la description,
+    # mais que nous n'avons pas encore trouvé de valeur, chercher un nombre à proximité
+    value = pcs_near_terms(description, gia_number)
+    if value is not None:
+        return value
+
+    # Si nous arrivons ici, aucune valeur PCS/Carat n'a été trouvée
+    return "N/A"
+
+def parse_pcs_carat_weight(pcs_carat):
+    """
+    Convertit la valeur PCS/Carat en float.
+    """
+    if pcs_carat == "N/A" or not pcs_carat:
+        return None
+    try:
+        return float(pcs_carat)
+    except (ValueError, IndexError):
+        return None
+
+def extract_gia_number(description):
+    """
+    Extrait le numéro GIA avec une gestion plus précise des cas.
+    Gère les cas où le numéro GIA est directement attaché à "GIA" sans espace.
+    """
+    if not isinstance(description, str):
+        return "UNKNOWN"
+
+    description = description.upper()
+    if GIA_TRIGGER not in description:
+        return "UNKNOWN"
+
+    # Format principal: GIA suivi d'un numéro, avec ou sans séparateurs
+    gia_match = GIA_PATTERN.search(description)
+    if gia_match:
+        return gia_match.group(1)
+
+    # Format alternatif: GIA collé à un numéro
+    gia_direct_match = GIA_DIRECT_PATTERN.search(description)
+    if gia_direct_match:
+        return gia_direct_match.group(1)
+
+    # Format avec tiret ou autre séparateur
+    gia_hyphen_match = GIA_HYPHEN_PATTERN.search(description)
+    if gia_hyphen_match:
+        return gia_hyphen_match.group(1)
+
+    # Format avec "N°" ou "No." ou "NUMBER"
+    gia_number_match = GIA_NUMBER_PATTERN.search(description)
+    if gia_number_match:
+        return gia_number_match.group(1)
+
+    # Si aucun numéro GIA n'est trouvé
+    return "UNKNOWN"
@@ -0,0 +1,210 @@
+# utils/incremental.py
+"""
+Retraitement incrémental : les résultats de chaque ligne sont conservés
+dans une base SQLite locale, indexés par une empreinte de la description
+et de la quantité.
+
+Quand un fichier est réimporté (par exemple après l'ajout de lignes), seules
+les lignes nouvelles ou modifiées passent par classify_frame ; les autres
+sont reprises de la base. Le résultat est identique à un traitement complet.
+
+La base est bornée (DEFAULT_MAX_ROWS lignes) : au-delà, les résultats les
+moins récemment utilisés sont supprimés.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+import pandas as pd
+
+from utils.data_processing import DESCRIPTION_COLUMN, classify_frame
+from utils.extractors import DIMENSION_BOUND_COLUMNS
+from utils.vectorized import merge_extraction_stats
+
+# À incrémenter quand la logique d'extraction change : les résultats
+# enregistrés avec une autre version ne sont plus réutilisés
+RESULTS_VERSION = 3
+
+DEFAULT_STORE_PATH = os.environ.get(
+    'VDG_RESULT_STORE', os.path.join(os.path.expanduser('~'), '.vd_global', 'results.sqlite'))
+
+# Nombre maximal de lignes conservées (environ 130 Mo) ; quand il est
+# dépassé, la base est ramenée à PRUNE_RATIO de ce nombre
+DEFAULT_MAX_ROWS = int(os.environ.get('VDG_RESULT_STORE_MAX_ROWS', 500_000))
+PRUNE_RATIO = 0.9
+
+# Colonnes produites par classify_frame, dans l'ordre où elles sont ajoutées
+OUTPUT_COLUMNS = (['Shape', 'Clarity', 'Color', 'Certi Number', 'Length', 'Width', 'Height',
+                   'MM Range'] + DIMENSION_BOUND_COLUMNS
+                  + ['PCS/Carat', 'Pieces per Carat Weight', 'Average Weight'])
+_WEIGHT_COLUMNS = ('Pieces per Carat Weight', 'Average Weight')
+
+# Nombre de clés par requête SQL (limite de paramètres de SQLite)
+_LOOKUP_CHUNK = 500
+
+
+def row_key(description, quantity):
+    """
+    Empreinte d'une ligne : version des résultats, description et quantité
+    (repr() distingue les types, ex. 3 et '3').
+    """
+    return hashlib.sha1(repr((RESULTS_VERSION, description, quantity)).encode('utf-8')).hexdigest()
+
+def row_keys(df):
+    """Empreintes de toutes les lignes du DataFrame."""
+    descriptions = df[DESCRIPTION_COLUMN].tolist()
+    quantities = df['Quantity'].tolist() if 'Quantity' in df.columns else [None] * len(df)
+    return [row_key(description, quantity) for description, quantity in zip(descriptions, quantities)]
+
+
+class ResultStore:
+    """
+    Base SQLite des résultats par ligne : empreinte -> valeurs des
+    colonnes OUTPUT_COLUMNS (JSON) et date de dernière utilisation. Une
+    connexion est ouverte par opération, ce qui permet de partager la base
+    entre threads et processus. `max_rows` (None : sans limite) borne le
+    nombre de lignes conservées.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH, max_rows=DEFAULT_MAX_ROWS):
+        if max_rows is not None and max_rows <= 0:
+            raise ValueError("max_rows must be positive")
+        self.path = path
+        self.max_rows = max_rows
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, row_values TEXT NOT NULL, '
+                         'used_at REAL NOT NULL DEFAULT 0)')
+            # Bases créées avant la limite de taille : leurs lignes sont les
+            # premières supprimées
+            columns = [row[1] for row in conn.execute('PRAGMA table_info(results)')]
+            if 'used_at' not in columns:
+                conn.execute('ALTER TABLE results ADD COLUMN used_at REAL NOT NULL DEFAULT 0')
+            conn.execute('CREATE INDEX IF NOT EXISTS results_by_use ON results (used_at)')
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def __len__(self):
+        with self._connect() as conn:
+            return conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def get_many(self, keys):
+        """
+        Retourne {empreinte: liste des valeurs} pour les empreintes connues,
+        et les marque comme utilisées.
+        """
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+        used_at = time.time()
+        with self._connect() as conn:
+            for start in range(0, len(unique_keys), _LOOKUP_CHUNK):
+                chunk = unique_keys[start:start + _LOOKUP_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                query = f'SELECT key, row_values FROM results WHERE key IN ({placeholders})'
+                for key, row_values in conn.execute(query, chunk):
+                    found[key] = json.loads(row_values)
+                conn.execute(f'UPDATE results SET used_at = ? WHERE key IN ({placeholders})',
+                             [used_at, *chunk])
+        return found
+
+    def put_many(self, items):
+        """
+        Enregistre des couples (empreinte, liste des valeurs), puis supprime
+        les lignes les moins récemment utilisées si la base dépasse max_rows.
+        """
+        used_at = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO results (key, row_values, used_at) VALUES (?, ?, ?)',
+                ((key, json.dumps(values), used_at) for key, values in items),
+            )
+            self._prune(conn)
+
+    def _prune(self, conn):
+        if self.max_rows is None:
+            return
+        rows = conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+        if rows <= self.max_rows:
+            return
+        excess = rows - int(self.max_rows * PRUNE_RATIO)
+        conn.execute('DELETE FROM results WHERE key IN '
+                     '(SELECT key FROM results ORDER BY used_at LIMIT ?)', (excess,))
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM results')
+
+def _plain(value):
+    """Valeur Python sérialisable : scalaires NumPy convertis, manquants -> None."""
+    if value is None:
+        return None
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+def _output_column(name, values, index):
+    """
+    Reconstruit une colonne avec les mêmes types que classify_frame :
+    poids en float64 s'il y en a au moins un (sinon None), Height en
+    chaîne, les autres colonnes par inférence sur les valeurs.
+    """
+    if name in _WEIGHT_COLUMNS:
+        if any(value is not None for value in values):
+            return pd.Series([float('nan') if value is None else value for value in values],
+                             index=index, dtype='float64')
+        return pd.Series(values, index=index, dtype=object)
+    column = pd.Series(values, index=index, dtype=object)
+    if name == 'Height':
+        return column.map(str, na_action='ignore')
+    return column.infer_objects()
+
+def classify_frame_incremental(df, store, **classify_options):
+    """
+    Comme classify_frame, mais ne traite que les lignes absentes de `store`
+    (ResultStore) et y enregistre leurs résultats. `classify_options` est
+    transmis à classify_frame. df.attrs['extraction_stats'] ne porte que
+    sur les lignes traitées ; les compteurs de lignes reprises et traitées
+    sont dans df.attrs['incremental_stats'].
+    """
+    if DESCRIPTION_COLUMN not in df.columns:
+        raise KeyError(f"'{DESCRIPTION_COLUMN}' column not found")
+
+    keys = row_keys(df)
+    stored = store.get_many(keys)
+    missing = [row for row, key in enumerate(keys) if key not in stored]
+
+    if missing:
+        processed = classify_frame(df.iloc[missing], **classify_options)
+        new_values = {}
+        for key, values in zip((keys[row] for row in missing),
+                               processed[OUTPUT_COLUMNS].itertuples(index=False, name=None)):
+            new_values[key] = [_plain(value) for value in values]
+        store.put_many(new_values.items())
+        stored.update(new_values)
+        extraction_stats = processed.attrs.get('extraction_stats')
+    else:
+        extraction_stats = merge_extraction_stats([])
+
+    result = df.copy()
+    for position, name in enumerate(OUTPUT_COLUMNS):
+        values = [stored[key][position] for key in keys]
+        result[name] = _output_column(name, values, result.index)
+    # classify_frame supprime la colonne Depth
+    result.drop(columns=['Depth'], errors='ignore', inplace=True)
+
+    if extraction_stats is not None:
+        result.attrs['extraction_stats'] = extraction_stats
+    result.attrs['incremental_stats'] = {
+        'rows': len(df),
+        'reused': len(df) - len(missing),
+        'processed': len(missing),
+    }
+    return result
@@ -0,0 +1,380 @@
+# utils/pipeline.py
+"""
+Traitement de classeurs en arrière-plan, pour l'application.
+
+Un ProcessingJob lit et classifie toutes les feuilles d'un ou plusieurs
+classeurs dans un thread, et publie l'avancement au fil des lots : lignes
+traitées (et nombre de lignes annoncé par les fichiers), indicateurs
+partiels et aperçu des premières lignes. L'interface n'attend pas la fin du
+traitement pour s'afficher ; elle relit l'état du travail à intervalle
+régulier.
+
+Les feuilles sont traitées en même temps dans un pool de threads, ou de
+processus (`executor='process'`) : le décodage XML d'openpyxl libère peu le
+GIL, plusieurs processus lisent vraiment en parallèle. La durée totale se
+rapproche alors de celle de la plus grosse feuille plutôt que de la somme.
+Les lignes du tableau combiné sont marquées avec leur fichier et leur
+feuille d'origine (utils.excel_io.SOURCE_COLUMNS).
+
+Une fois le tableau complet assemblé et compacté, l'export par défaut est
+préparé dans le même thread, en dehors du rendu de la page ; les autres
+formats le sont à la demande, chacun dans son propre thread.
+
+Les travaux sont gardés dans un JobRegistry par clé (empreinte des
+fichiers, options), bornés en nombre et en durée de vie comme le cache des
+résultats.
+"""
+
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+
+from utils.aggregation import column_counts, combination_counts, merge_combinations
+from utils.cache import RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_TTL
+from utils.data_processing import DESCRIPTION_COLUMN
+from utils.excel_io import (
+    DEFAULT_BATCH_SIZE,
+    EXPORT_FORMATS,
+    assemble_batches,
+    export_bytes,
+    iter_classified_batches,
+    sheet_row_counts,
+    tag_source,
+)
+from utils.profiling import Profiler, profiling, stage
+from utils.schema import compact_frame
+from utils.vectorized import process_pool
+
+# Intervalle de rafraîchissement de l'affichage pendant un traitement, en secondes
+REFRESH_INTERVAL = 0.5
+
+# Lignes gardées pour l'aperçu affiché pendant le traitement
+DEFAULT_PREVIEW_ROWS = 100
+
+DEFAULT_EXPORT_FORMAT = next(iter(EXPORT_FORMATS))
+
+# Pool utilisé pour traiter les feuilles en même temps
+EXECUTORS = ('thread', 'process')
+DEFAULT_EXECUTOR = os.environ.get('VDG_UPLOAD_EXECUTOR', 'thread')
+
+
+class _Cancelled(Exception):
+    """Interrompt la lecture d'une feuille quand le travail est annulé."""
+
+
+def classify_sheet(data, file_name, sheet_name, batch_size=DEFAULT_BATCH_SIZE, on_batch=None,
+                   on_total=None, **classify_options):
+    """
+    Lit et classifie une feuille d'un classeur (octets) ; chaque lot est
+    marqué avec le fichier et la feuille d'origine, puis passé à
+    `on_batch(lot)`. Retourne (lots, mesures du Profiler de la feuille) ;
+    les lots valent None si la feuille n'a pas de colonne description.
+    Fonction de module : peut être exécutée dans un autre processus.
+    """
+    results = []
+    with profiling() as profiler:
+        try:
+            for result in iter_classified_batches(io.BytesIO(data), sheet_name=sheet_name,
+                                                  batch_size=batch_size, on_total=on_total,
+                                                  **classify_options):
+                results.append(tag_source(result, file_name, sheet_name))
+                if on_batch is not None:
+                    on_batch(result)
+        except KeyError:
+            results = None
+    return results, profiler.to_dict()
+
+
+class ProcessingJob:
+    """
+    Lecture et classification de toutes les feuilles de classeurs, donnés
+    par une liste de (nom du fichier, octets), dans un thread.
+
+    `executor` : 'thread' ou 'process' ; `workers` : taille du pool (None :
+    nombre de cœurs, au plus une par feuille). `classify_options` est
+    transmis à iter_classified_batches (mode, cache, store...). Avec des
+    processus, le cache des descriptions n'est pas partagé et le mode
+    'parallel' devient 'vectorized' (les feuilles sont déjà réparties), et
+    les lignes d'une feuille ne sont publiées qu'à la fin de celle-ci.
+
+    Le résultat (`result`) est au schéma compact ; une erreur du traitement
+    est conservée dans `error`. Les feuilles sans colonne description sont
+    ignorées (`skipped`) ; si aucune n'en a, l'erreur est un KeyError.
+    """
+
+    def __init__(self, files, batch_size=DEFAULT_BATCH_SIZE, preview_rows=DEFAULT_PREVIEW_ROWS,
+                 export_format=DEFAULT_EXPORT_FORMAT, executor=DEFAULT_EXECUTOR, workers=None,
+                 **classify_options):
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor: {executor!r}")
+        self.batch_size = batch_size
+        self.preview_rows = preview_rows
+        self.export_format = export_format
+        self.executor = executor
+        self.workers = workers
+        self.classify_options = classify_options
+        self.sheets = []
+        self.skipped = []
+        self.sheets_done = 0
+        self.rows = 0
+        self.result = None
+        self.error = None
+        self._files = list(files)
+        self._totals = {}
+        self._combos = None
+        self._preview = None
+        self._profiler = Profiler()
+        self._exports = {}
+        self._export_errors = {}
+        self._pending_exports = set()
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Arrête le traitement après les lots en cours."""
+        self._cancelled.set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Attend la fin du traitement (pas celle de l'export) ; retourne done."""
+        return self._done.wait(timeout)
+
+    def _total_rows(self):
+        totals = [rows for rows in self._totals.values() if rows is not None]
+        return sum(totals) if totals else None
+
+    @property
+    def total_rows(self):
+        """Lignes de données annoncées par les fichiers (estimation), None si inconnu."""
+        with self._lock:
+            return self._total_rows()
+
+    def progress(self):
+        """
+        Part des lignes traitées, entre 0 et 1 ; None tant que le nombre de
+        lignes annoncé par les fichiers n'est pas connu.
+        """
+        with self._lock:
+            if self.done:
+                return 1.0
+            total = self._total_rows()
+            if not total:
+                return None
+            return min(self.rows / total, 1.0)
+
+    def partial_summary(self):
+        """
+        Indicateurs des lignes déjà traitées : {'rows', 'unique'}, comme
+        utils.aggregation.summarize. None avant le premier lot.
+        """
+        with self._lock:
+            combos = self._combos
+            rows = self.rows
+        if combos is None:
+            return None
+        counts = column_counts(combos)
+        return {'rows': rows, 'unique': {column: len(values) for column, values in counts.items()}}
+
+    def preview(self):
+        """Premières lignes classifiées (schéma compact), None avant le premier lot."""
+        with self._lock:
+            return self._preview
+
+    def profile(self):
+        """Mesures du traitement et des exports (Profiler.to_dict)."""
+        with self._lock:
+            return self._profiler.to_dict()
+
+    def _set_total(self, sheet, rows):
+        with self._lock:
+            self._totals[sheet] = rows
+
+    def _publish(self, result):
+        if self._cancelled.is_set():
+            raise _Cancelled()
+        combos = combination_counts(result)
+        preview = compact_frame(result.head(self.preview_rows)) if self._preview is None else None
+        with self._lock:
+            self.rows += len(result)
+            self._combos = combos if self._combos is None else merge_combinations([self._combos, combos])
+            if preview is not None and self._preview is None:
+                self._preview = preview
+
+    def _sheet_done(self, profile):
+        with self._lock:
+            self.sheets_done += 1
+            self._profiler.merge(profile)
+
+    def _submit(self, pool, extraction_pool, file_name, data, sheet_name):
+        if self.executor == 'process':
+            options = {key: value for key, value in self.classify_options.items() if key != 'cache'}
+            if options.get('mode') == 'parallel':
+                options['mode'] = 'vectorized'
+            return pool.submit(classify_sheet, data, file_name, sheet_name, self.batch_size, **options)
+        options = dict(self.classify_options)
+        if extraction_pool is not None:
+            options['executor'] = extraction_pool
+        return pool.submit(classify_sheet, data, file_name, sheet_name, self.batch_size,
+                           on_batch=self._publish,
+                           on_total=partial(self._set_total, (file_name, sheet_name)),
+                           **options)
+
+    def _process(self):
+        """Tableau combiné au schéma compact ; None si le travail est annulé."""
+        tasks = []
+        for file_name, data in self._files:
+            for sheet_name, rows in sheet_row_counts(io.BytesIO(data)).items():
+                tasks.append((file_name, data, sheet_name))
+                # Estimation en attendant la ligne d'en-tête lue par la feuille
+                self._set_total((file_name, sheet_name), max(rows - 1, 0) if rows else None)
+        self.sheets = [(file_name, sheet_name) for file_name, _, sheet_name in tasks]
+
+        workers = max(1, min(self.workers or os.cpu_count() or 1, len(tasks)))
+        pool_class = process_pool if self.executor == 'process' else ThreadPoolExecutor
+        outputs = [None] * len(tasks)
+        # Mode 'parallel' avec des threads : un seul pool de processus
+        # d'extraction, partagé par toutes les feuilles
+        extraction_workers = self.classify_options.get('workers') or os.cpu_count() or 1
+        if (self.executor == 'thread' and self.classify_options.get('mode') == 'parallel'
+                and extraction_workers > 1):
+            extraction_context = process_pool(extraction_workers)
+        else:
+            extraction_context = nullcontext()
+        with extraction_context as extraction_pool, pool_class(workers) as pool:
+            futures = {self._submit(pool, extraction_pool, *task): i for i, task in enumerate(tasks)}
+            try:
+                for future in as_completed(futures):
+                    results, profile = future.result()
+                    if results is None:
+                        # Feuille ignorée : elle ne compte plus dans la progression
+                        self._set_total(self.sheets[futures[future]], 0)
+                    if self.executor == 'process':
+                        for result in results or []:
+                            self._publish(result)
+                    self._sheet_done(profile)
+                    outputs[futures[future]] = results
+            except BaseException:
+                # Annulation ou erreur : les feuilles pas encore commencées sont
+                # abandonnées, celles en cours s'arrêtent au lot suivant
+                self._cancelled.set()
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+
+        self.skipped = [sheet for sheet, results in zip(self.sheets, outputs) if results is None]
+        results = [result for sheet_results in outputs if sheet_results for result in sheet_results]
+        if not results:
+            raise KeyError(f"'{DESCRIPTION_COLUMN}' column not found")
+        with profiling(self._profiler):
+            df = assemble_batches(results)
+            with stage('compact', rows=len(df)):
+                return compact_frame(df)
+
+    def _run(self):
+        try:
+            df = self._process()
+        except _Cancelled:
+            df = None
+        except Exception as e:
+            self.error = e
+            df = None
+        finally:
+            self._files = None
+        with self._lock:
+            self.result = df
+            if df is not None:
+                self._pending_exports.add(self.export_format)
+        self._done.set()
+        if df is not None:
+            self._export(self.export_format)
+
+    def _export(self, export_format):
+        start = time.perf_counter()
+        try:
+            data = export_bytes(self.result, export_format)
+        except Exception as e:
+            with self._lock:
+                self._export_errors[export_format] = e
+                self._pending_exports.discard(export_format)
+            return
+        with self._lock:
+            self._exports[export_format] = data
+            self._pending_exports.discard(export_format)
+            self._profiler.add_stage('export', time.perf_counter() - start, len(self.result))
+
+    def export_ready(self, export_format):
+        """Vrai si l'export dans ce format est terminé (avec ou sans erreur)."""
+        with self._lock:
+            return export_format in self._exports or export_format in self._export_errors
+
+    def export(self, export_format):
+        """
+        Octets de l'export dans `export_format` s'il est prêt ; sinon lance
+        sa préparation en arrière-plan (une fois le traitement terminé) et
+        retourne None. Relève l'erreur de l'export s'il a échoué (ImportError
+        sans pyarrow, par exemple).
+        """
+        with self._lock:
+            if export_format in self._export_errors:
+                raise self._export_errors[export_format]
+            if export_format in self._exports:
+                return self._exports[export_format]
+            if self.result is None or export_format in self._pending_exports:
+                return None
+            self._pending_exports.add(export_format)
+        threading.Thread(target=self._export, args=(export_format,), daemon=True).start()
+        return None
+
+
+class JobRegistry:
+    """
+    Travaux par clé, partagés entre les sessions. Au plus `max_entries`
+    travaux sont gardés (les moins récemment consultés sont annulés et
+    retirés) ; un travail non consulté depuis `ttl` secondes est retiré.
+    Un travail en erreur est gardé, avec son erreur, jusqu'à ce qu'une
+    relance soit demandée (`retry`).
+    """
+
+    def __init__(self, max_entries=RESULT_CACHE_MAX_ENTRIES, ttl=RESULT_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._jobs)
+
+    def get_or_start(self, key, factory, retry=False):
+        """
+        Travail de la clé `key` ; s'il n'existe pas, `factory()` crée un
+        ProcessingJob, démarré ici. Avec `retry`, un travail terminé en
+        erreur est remplacé par un nouveau.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for stale in [k for k, (_, accessed) in self._jobs.items() if now - accessed > self.ttl]:
+                self._jobs.pop(stale)[0].cancel()
+            entry = self._jobs.get(key)
+            if entry is not None and not (retry and entry[0].error is not None):
+                job = entry[0]
+                self._jobs.move_to_end(key)
+            else:
+                job = factory().start()
+            self._jobs[key] = (job, now)
+            while len(self._jobs) > self.max_entries:
+                self._jobs.popitem(last=False)[1][0].cancel()
+            return job
@@ -0,0 +1,113 @@
+# utils/profiling.py
+"""
+Instrumentation du pipeline : durée, nombre de lignes et débit de chaque
+étape (lecture, extracteurs, poids, export...), et compteurs des branches
+de cascade retenues par les extracteurs.
+
+Les mesures ne sont enregistrées qu'à l'intérieur d'un bloc
+`with profiling(profiler):` ; en dehors, stage() et count_branches() ne
+font rien et le coût est négligeable.
+"""
+
+import contextvars
+import json
+import time
+from contextlib import contextmanager
+
+_ACTIVE_PROFILER = contextvars.ContextVar('active_profiler', default=None)
+
+
+class Profiler:
+    """
+    Accumule les mesures par étape (durée cumulée, lignes, appels) et les
+    compteurs de branches par extracteur.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.branches = {}
+
+    def add_stage(self, name, seconds, rows=None, calls=1):
+        record = self.stages.setdefault(name, {'seconds': 0.0, 'rows': None, 'calls': 0})
+        record['seconds'] += seconds
+        record['calls'] += calls
+        if rows is not None:
+            record['rows'] = (record['rows'] or 0) + rows
+
+    def count(self, extractor, counts):
+        """Ajoute des compteurs {branche: nombre de lignes} pour un extracteur."""
+        branches = self.branches.setdefault(extractor, {})
+        for branch, n in counts.items():
+            if n:
+                branches[branch] = branches.get(branch, 0) + int(n)
+
+    def merge(self, data):
+        """Ajoute les mesures d'un autre profil (format de to_dict)."""
+        if not data:
+            return
+        for record in data.get('stages', []):
+            self.add_stage(record['name'], record['seconds'], record['rows'], record['calls'])
+        for extractor, counts in data.get('branches', {}).items():
+            self.count(extractor, counts)
+
+    def to_dict(self):
+        """Mesures sérialisables : liste des étapes et compteurs de branches."""
+        stages = []
+        for name, record in self.stages.items():
+            rows = record['rows']
+            seconds = record['seconds']
+            stages.append({
+                'name': name,
+                'seconds': seconds,
+                'rows': rows,
+                'calls': record['calls'],
+                'rows_per_second': rows / seconds if rows is not None and seconds > 0 else None,
+            })
+        return {'stages': stages, 'branches': {k: dict(v) for k, v in self.branches.items()}}
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent)
+
+def active_profiler():
+    """Profiler actif dans le contexte courant, ou None."""
+    return _ACTIVE_PROFILER.get()
+
+@contextmanager
+def profiling(profiler=None):
+    """
+    Active un Profiler (nouveau si None) pour la durée du bloc et le retourne.
+    """
+    if profiler is None:
+        profiler = Profiler()
+    token = _ACTIVE_PROFILER.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _ACTIVE_PROFILER.reset(token)
+
+@contextmanager
+def stage(name, rows=None):
+    """
+    Chronomètre le bloc sous le nom `name` si un profiler est actif.
+    """
+    profiler = _ACTIVE_PROFILER.get()
+    if profiler is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.add_stage(name, time.perf_counter() - start, rows)
+
+def record_stage(name, seconds, rows=None):
+    """Enregistre une durée mesurée à part (ex. lecture d'un lot)."""
+    profiler = _ACTIVE_PROFILER.get()
+    if profiler is not None:
+        profiler.add_stage(name, seconds, rows)
+
+def count_branches(extractor, counts):
+    """Enregistre les branches retenues par un extracteur si un profiler est actif."""
+    profiler = _ACTIVE_PROFILER.get()
+    if profiler is not None:
+        profiler.count(extractor, counts)
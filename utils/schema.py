@@ -0,0 +1,85 @@
+# utils/schema.py
+"""
+Schéma compact du tableau de résultats, pour réduire la mémoire par ligne
+et accélérer les regroupements.
+
+- Shape, Clarity, Color et les autres colonnes texte très répétées
+  (fournisseur, description...) : type category.
+- Length, Width et les bornes des dimensions (Length Min ... Height Max) : float32.
+- PCS/Carat : nombre nullable (Float32).
+- Certi Number : chaîne nullable.
+- MM Range et Height (chaînes "1.5-1.85") : conservées pour l'affichage et
+  les exports, en category comme les autres textes répétés ; les calculs
+  utilisent les bornes numériques extraites avec les dimensions.
+
+La valeur « non trouvé » de chaque extracteur (MISSING_VALUES : "N/A" pour
+Shape et PCS/Carat, "UNKNOWN" pour Color et Certi Number ; Clarity vaut
+déjà None) devient une valeur manquante, qui n'est pas proposée dans les
+filtres à choix. Les comptages (utils.aggregation) la ramènent à la valeur
+« non trouvé » : ils sont identiques avant et après compactage.
+"""
+
+import pandas as pd
+
+from utils.extractors import DIMENSION_BOUND_COLUMNS
+
+CATEGORY_COLUMNS = ['Shape', 'Clarity', 'Color']
+FLOAT32_COLUMNS = ['Length', 'Width'] + DIMENSION_BOUND_COLUMNS
+
+# Valeur renvoyée par l'extracteur de chaque colonne quand rien n'est trouvé
+MISSING_VALUES = {
+    'Shape': 'N/A',
+    'Color': 'UNKNOWN',
+    'Certi Number': 'UNKNOWN',
+    'PCS/Carat': 'N/A',
+}
+
+# Colonnes texte converties en category si leurs valeurs distinctes
+# représentent au plus cette part des lignes
+CATEGORY_MAX_RATIO = 0.5
+
+
+def _is_text(column):
+    # Colonne objet de types mélangés (nombres et textes) : laissée telle quelle,
+    # une catégorie de types mélangés ne peut pas être convertie pour l'affichage
+    if column.dtype == object:
+        return pd.api.types.infer_dtype(column, skipna=True) in ('string', 'empty')
+    return pd.api.types.is_string_dtype(column.dtype)
+
+def compact_frame(df):
+    """
+    Retourne une copie de `df` au schéma compact (voir le module). Les
+    colonnes absentes sont ignorées et l'ordre des colonnes est conservé.
+    """
+    df = df.copy()
+
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns:
+            categories = df[column].astype('category')
+            if MISSING_VALUES.get(column) in categories.cat.categories:
+                categories = categories.cat.remove_categories([MISSING_VALUES[column]])
+            df[column] = categories
+    for column in FLOAT32_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors='coerce').astype('float32')
+    if 'PCS/Carat' in df.columns:
+        df['PCS/Carat'] = pd.to_numeric(df['PCS/Carat'], errors='coerce').astype('Float32')
+    if 'Certi Number' in df.columns:
+        certificates = df['Certi Number'].astype('string')
+        df['Certi Number'] = certificates.mask(certificates == MISSING_VALUES['Certi Number'])
+
+    # Autres colonnes texte très répétées
+    rows = len(df)
+    for column in df.columns:
+        series = df[column]
+        if column in CATEGORY_COLUMNS or column == 'Certi Number' or not _is_text(series):
+            continue
+        if rows and series.nunique(dropna=True) <= rows * CATEGORY_MAX_RATIO:
+            df[column] = series.astype('category')
+    return df
+
+def memory_per_row(df):
+    """Mémoire occupée par ligne, en octets (chaînes comprises)."""
+    if not len(df):
+        return 0.0
+    return float(df.memory_usage(deep=True, index=False).sum()) / len(df)
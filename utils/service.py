@@ -0,0 +1,421 @@
+# utils/service.py
+"""
+Service HTTP local d'extraction : application ASGI, sans framework, qui
+expose les extracteurs aux autres outils internes.
+
+- POST /extract : tableau JSON de descriptions (Content-Type
+  application/json) ou flux NDJSON, une description par ligne
+  (application/x-ndjson). La réponse a le même format que la requête :
+  un objet par description, dans l'ordre, avec les colonnes de
+  SERVICE_COLUMNS. Une valeur absente ou non trouvée vaut null : les
+  valeurs « non trouvé » des extracteurs ("N/A", "UNKNOWN", voir
+  utils.schema.MISSING_VALUES) ne sont jamais renvoyées. Les réponses
+  NDJSON sont envoyées au fur et à mesure de la lecture du flux.
+- GET /health : état du service, latences (percentiles) et débit.
+
+Les requêtes simultanées sont regroupées en micro-lots (MicroBatcher) :
+les descriptions arrivées pendant `max_wait` secondes, jusqu'à `max_rows`,
+sont extraites ensemble par le moteur vectorisé, avec un cache de
+descriptions partagé entre les lots.
+
+Le serveur (uvicorn) n'est importé que par serve().
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import DescriptionCache
+from utils.schema import MISSING_VALUES
+from utils.vectorized import EXTRACTED_COLUMNS, extract_columns
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Micro-lots : nombre maximal de descriptions par lot et attente maximale
+# (secondes) pour compléter un lot
+DEFAULT_MAX_ROWS = 5_000
+DEFAULT_MAX_WAIT = 0.01
+
+# Taille maximale d'un corps JSON, et nombre de lignes NDJSON envoyées
+# ensemble à l'extraction
+MAX_BODY_BYTES = 50 * 1024 * 1024
+STREAM_CHUNK_ROWS = 1_000
+
+# Nombre de latences conservées pour les percentiles
+LATENCY_WINDOW = 10_000
+
+# Colonnes renvoyées pour chaque description (Depth est toujours vide)
+SERVICE_COLUMNS = [name for name in EXTRACTED_COLUMNS if name != 'Depth']
+
+JSON_TYPE = 'application/json'
+NDJSON_TYPE = 'application/x-ndjson'
+
+
+class RequestError(ValueError):
+    """Requête invalide : renvoyée au client avec le code `status`."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def extract_records(descriptions, cache=None):
+    """
+    Extrait les attributs d'une liste de descriptions. Retourne une liste
+    de dictionnaires (colonnes de SERVICE_COLUMNS), valeurs manquantes ou
+    non trouvées à None.
+    """
+    if not descriptions:
+        return []
+    frame = extract_columns(pd.Series(descriptions, dtype=object), cache=cache)[SERVICE_COLUMNS]
+    missing = frame.isna()
+    for column, value in MISSING_VALUES.items():
+        missing[column] |= frame[column] == value
+    frame = frame.astype(object).where(~missing, None)
+    return frame.to_dict('records')
+
+def parse_descriptions(items):
+    """
+    Vérifie une liste de descriptions décodées du JSON : chaînes ou null.
+    """
+    if not isinstance(items, list):
+        raise RequestError("expected a JSON array of descriptions")
+    for item in items:
+        if item is not None and not isinstance(item, str):
+            raise RequestError("descriptions must be strings or null")
+    return items
+
+def parse_ndjson_line(line):
+    """Description d'une ligne NDJSON (octets : chaîne JSON ou null)."""
+    try:
+        item = json.loads(line)
+    except ValueError:
+        raise RequestError(f"invalid NDJSON line: {line[:80]!r}")
+    return parse_descriptions([item])[0]
+
+
+class ServiceMetrics:
+    """
+    Compteurs du service : requêtes, descriptions, lots, durée
+    d'extraction, et latences des dernières requêtes (LATENCY_WINDOW).
+    """
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.descriptions = 0
+        self.batches = 0
+        self.extract_seconds = 0.0
+        self._latencies = deque(maxlen=window)
+
+    def record_request(self, seconds, error=False):
+        self.requests += 1
+        self.errors += int(error)
+        self._latencies.append(seconds)
+
+    def record_batch(self, rows, seconds):
+        self.batches += 1
+        self.descriptions += rows
+        self.extract_seconds += seconds
+
+    def snapshot(self):
+        """Mesures sérialisables en JSON."""
+        uptime = time.monotonic() - self.started
+        latency = {}
+        if self._latencies:
+            values = np.array(self._latencies) * 1000
+            for name, q in (('p50', 50), ('p90', 90), ('p99', 99)):
+                latency[name] = round(float(np.percentile(values, q)), 3)
+            latency['max'] = round(float(values.max()), 3)
+        return {
+            'uptime_seconds': round(uptime, 3),
+            'requests': self.requests,
+            'errors': self.errors,
+            'descriptions': self.descriptions,
+            'batches': self.batches,
+            'mean_batch_size': round(self.descriptions / self.batches, 1) if self.batches else 0.0,
+            'latency_ms': latency,
+            'descriptions_per_second': round(self.descriptions / uptime, 1) if uptime > 0 else 0.0,
+            'extraction_rows_per_second': (round(self.descriptions / self.extract_seconds, 1)
+                                           if self.extract_seconds > 0 else 0.0),
+        }
+
+
+class MicroBatcher:
+    """
+    Regroupe les descriptions des requêtes simultanées en lots extraits
+    dans un thread dédié, pour ne pas bloquer la boucle asyncio.
+
+    Un lot part dès qu'il atteint `max_rows` descriptions, ou `max_wait`
+    secondes après l'arrivée de sa première requête. Une requête plus
+    grande que `max_rows` est découpée en plusieurs lots.
+    """
+
+    def __init__(self, max_rows=DEFAULT_MAX_ROWS, max_wait=DEFAULT_MAX_WAIT,
+                 cache=None, metrics=None):
+        if max_rows <= 0:
+            raise ValueError("max_rows must be positive")
+        self.max_rows = max_rows
+        self.max_wait = max_wait
+        self.cache = cache if cache is not None else DescriptionCache()
+        self.metrics = metrics if metrics is not None else ServiceMetrics()
+        self._queue = None
+        self._worker = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='extract')
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def extract(self, descriptions):
+        """Attributs de chaque description (voir extract_records), dans l'ordre."""
+        self._ensure_worker()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for start in range(0, len(descriptions), self.max_rows):
+            future = loop.create_future()
+            self._queue.put_nowait((descriptions[start:start + self.max_rows], future))
+            futures.append(future)
+        records = []
+        for part in await asyncio.gather(*futures):
+            records.extend(part)
+        return records
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            rows = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+            while rows < self.max_rows:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                rows += len(item[0])
+            await self._extract_batch(loop, batch, rows)
+
+    async def _extract_batch(self, loop, batch, rows):
+        descriptions = [description for part, _ in batch for description in part]
+        start = time.perf_counter()
+        try:
+            records = await loop.run_in_executor(self._executor, extract_records,
+                                                 descriptions, self.cache)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.metrics.record_batch(rows, time.perf_counter() - start)
+        position = 0
+        for part, future in batch:
+            if not future.done():
+                future.set_result(records[position:position + len(part)])
+            position += len(part)
+
+    async def close(self):
+        """Arrête le lot en cours d'attente et le thread d'extraction."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        self._executor.shutdown(wait=False)
+
+
+async def _read_body(receive, limit=MAX_BODY_BYTES):
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            raise RequestError("client disconnected")
+        body = message.get('body', b'')
+        size += len(body)
+        if size > limit:
+            raise RequestError("request body too large", status=413)
+        chunks.append(body)
+        if not message.get('more_body', False):
+            return b''.join(chunks)
+
+async def _iter_lines(receive):
+    """Lignes non vides (octets) d'un corps reçu par morceaux."""
+    pending = b''
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            raise RequestError("client disconnected")
+        pending += message.get('body', b'')
+        *lines, pending = pending.split(b'\n')
+        for line in lines:
+            if line.strip():
+                yield line
+        if not message.get('more_body', False):
+            if pending.strip():
+                yield pending
+            return
+
+async def _start_response(send, status, content_type):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', content_type.encode('latin-1'))],
+    })
+
+async def _send_json(send, status, payload):
+    await _start_response(send, status, JSON_TYPE)
+    await send({'type': 'http.response.body', 'body': json.dumps(payload).encode('utf-8')})
+
+def _ndjson(records):
+    return ''.join(json.dumps(record) + '\n' for record in records).encode('utf-8')
+
+def _content_type(scope):
+    for name, value in scope.get('headers', []):
+        if name == b'content-type':
+            return value.decode('latin-1').split(';')[0].strip().lower()
+    return JSON_TYPE
+
+async def _extract_json(receive, send, batcher):
+    try:
+        items = json.loads(await _read_body(receive))
+    except ValueError:
+        raise RequestError("invalid JSON body")
+    records = await batcher.extract(parse_descriptions(items))
+    await _send_json(send, 200, records)
+
+async def _extract_ndjson(receive, send, batcher):
+    """
+    Lit le flux par paquets de STREAM_CHUNK_ROWS lignes et renvoie les
+    résultats de chaque paquet dès qu'ils sont extraits. Une erreur après le
+    premier envoi (ligne invalide, échec de l'extraction) termine la réponse
+    par une ligne {"error": ...} (voir _send_error).
+    """
+    started = False
+
+    async def flush(chunk):
+        nonlocal started
+        records = await batcher.extract(chunk)
+        if not started:
+            await _start_response(send, 200, NDJSON_TYPE)
+            started = True
+        await send({'type': 'http.response.body', 'body': _ndjson(records), 'more_body': True})
+
+    chunk = []
+    async for line in _iter_lines(receive):
+        chunk.append(parse_ndjson_line(line))
+        if len(chunk) >= STREAM_CHUNK_ROWS:
+            await flush(chunk)
+            chunk = []
+    if chunk or not started:
+        await flush(chunk)
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+class _TrackedSend:
+    """Transmet les messages ASGI en notant si la réponse est commencée ou terminée."""
+
+    def __init__(self, send):
+        self._send = send
+        self.started = False
+        self.finished = False
+
+    async def __call__(self, message):
+        if message['type'] == 'http.response.start':
+            self.started = True
+        elif message['type'] == 'http.response.body' and not message.get('more_body', False):
+            self.finished = True
+        await self._send(message)
+
+
+async def _send_error(send, status, message):
+    """
+    Réponse d'erreur JSON ; si la réponse est déjà commencée (flux NDJSON),
+    une seule réponse est permise par requête : une ligne {"error": ...}
+    termine le corps. Rien n'est envoyé si la réponse est déjà terminée.
+    """
+    if not send.started:
+        await _send_json(send, status, {'error': message})
+    elif not send.finished:
+        await send({'type': 'http.response.body', 'body': _ndjson([{'error': message}])})
+
+def create_app(batcher=None, **batch_options):
+    """
+    Application ASGI du service. `batch_options` (max_rows, max_wait,
+    cache) sont transmis au MicroBatcher créé si `batcher` n'est pas fourni.
+    """
+    batcher = batcher if batcher is not None else MicroBatcher(**batch_options)
+    metrics = batcher.metrics
+
+    async def lifespan(receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await batcher.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def app(scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        path, method = scope['path'].rstrip('/') or '/', scope['method']
+        if path == '/health':
+            if method != 'GET':
+                await _send_json(send, 405, {'error': "method not allowed"})
+                return
+            await _send_json(send, 200, {'status': 'ok', **metrics.snapshot()})
+            return
+        if path != '/extract':
+            await _send_json(send, 404, {'error': "not found"})
+            return
+        if method != 'POST':
+            await _send_json(send, 405, {'error': "method not allowed"})
+            return
+
+        start = time.perf_counter()
+        error = False
+        send = _TrackedSend(send)
+        try:
+            if _content_type(scope) == NDJSON_TYPE:
+                await _extract_ndjson(receive, send, batcher)
+            else:
+                await _extract_json(receive, send, batcher)
+        except RequestError as e:
+            error = True
+            await _send_error(send, e.status, str(e))
+        except Exception:
+            error = True
+            await _send_error(send, 500, "extraction failed")
+            raise
+        finally:
+            metrics.record_request(time.perf_counter() - start, error=error)
+
+    app.batcher = batcher
+    return app
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, log_level='info', **batch_options):
+    """
+    Lance le service avec uvicorn (importé ici seulement). Bloquant.
+    """
+    import uvicorn
+
+    uvicorn.run(create_app(**batch_options), host=host, port=port, log_level=log_level)
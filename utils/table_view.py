@@ -0,0 +1,84 @@
+# utils/table_view.py
+"""
+Vue paginée du tableau de résultats : filtres sur les colonnes extraites,
+tri et découpage en pages, calculés côté serveur.
+
+Seule la page affichée est envoyée au navigateur ; le filtrage et le tri
+produisent un tableau de positions, réutilisable tant que les critères ne
+changent pas.
+"""
+
+import numpy as np
+
+PAGE_SIZES = (50, 100, 500, 1000)
+DEFAULT_PAGE_SIZE = 100
+
+# Colonnes filtrées par liste de valeurs, et colonne filtrée par texte
+CHOICE_FILTER_COLUMNS = ['Shape', 'Clarity', 'Color']
+TEXT_FILTER_COLUMN = 'Certi Number'
+
+# Bornes de taille (mm) utilisées par le filtre de taille
+SIZE_FILTER_COLUMNS = ('Length Min', 'Length Max')
+
+
+def filter_options(df, column):
+    """Valeurs distinctes non vides d'une colonne, triées, pour un filtre à choix."""
+    values = df[column].dropna().unique()
+    return sorted(values, key=str)
+
+def size_limits(df):
+    """
+    Plus petite et plus grande taille (mm) du tableau, pour borner le filtre
+    de taille ; None si aucune ligne n'a de taille.
+    """
+    low_column, high_column = SIZE_FILTER_COLUMNS
+    low, high = df[low_column].min(), df[high_column].max()
+    if low != low or high != high:
+        return None
+    return float(low), float(high)
+
+def view_positions(df, choices=None, text=None, sort_by=None, ascending=True, size=None):
+    """
+    Positions (iloc) des lignes à afficher, dans l'ordre d'affichage.
+
+    `choices` : {colonne: valeurs retenues}, une liste vide ne filtre pas.
+    `text` : texte recherché dans 'Certi Number' (sans tenir compte de la casse).
+    `size` : intervalle (min, max) en mm ; seules les lignes dont la plage de
+    taille le chevauche sont retenues (les lignes sans taille sont exclues).
+    `sort_by` : colonne de tri (tri stable, valeurs manquantes en dernier).
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for column, values in (choices or {}).items():
+        if values:
+            mask &= df[column].isin(values).to_numpy(dtype=bool)
+    if text:
+        mask &= (df[TEXT_FILTER_COLUMN].astype(str)
+                 .str.contains(text.strip(), case=False, regex=False, na=False)
+                 .to_numpy(dtype=bool))
+    if size is not None:
+        low_column, high_column = SIZE_FILTER_COLUMNS
+        low, high = size
+        mask &= (df[high_column] >= low).to_numpy(dtype=bool)
+        mask &= (df[low_column] <= high).to_numpy(dtype=bool)
+    positions = np.flatnonzero(mask)
+
+    if sort_by is not None and len(positions):
+        values = df[sort_by].iloc[positions].reset_index(drop=True)
+        options = dict(ascending=ascending, kind='stable', na_position='last')
+        try:
+            order = values.sort_values(**options).index.to_numpy()
+        except TypeError:
+            # Colonne de types mélangés (nombres et textes) : tri sur le texte
+            order = values.sort_values(key=lambda v: v.map(str, na_action='ignore'),
+                                       **options).index.to_numpy()
+        positions = positions[order]
+    return positions
+
+def page_count(rows, page_size):
+    """Nombre de pages (au moins une, même si le tableau est vide)."""
+    return max(1, -(-rows // page_size))
+
+def page_frame(df, positions, page, page_size):
+    """Lignes de la page `page` (numérotée à partir de 1)."""
+    start = (page - 1) * page_size
+    return df.iloc[positions[start:start + page_size]]
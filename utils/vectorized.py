@@ -0,0 +1,266 @@
+# utils/vectorized.py
+
+"""
+Extraction sur les descriptions distinctes.
+
+Les descriptions sont dédoublonnées (pd.factorize) : chaque extracteur
+d'utils.extractors est appliqué une seule fois par chaîne distincte, puis
+les résultats sont redistribués sur les lignes. Le résultat est identique à
+celui des extracteurs appliqués ligne par ligne, sans recopier leurs
+cascades : sur des descriptions répétées, le gain vient du dédoublonnage.
+"""
+
+import multiprocessing
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.extractors import (
+    DIMENSION_BOUND_COLUMNS,
+    extract_color,
+    extract_gia_number,
+    extract_pcs_carat,
+    extract_shape,
+    extracting_clarity,
+    scan_clarity_stage,
+    scan_dimensions,
+)
+from utils.profiling import active_profiler, count_branches, profiling, stage
+from utils.schema import MISSING_VALUES
+
+DIMENSION_COLUMNS = ['Length', 'Width', 'Height', 'MM Range', 'Depth'] + DIMENSION_BOUND_COLUMNS
+EXTRACTED_COLUMNS = ['Shape', 'Clarity', 'Color', 'Certi Number'] + DIMENSION_COLUMNS + ['PCS/Carat']
+
+# Mode parallèle : taille des blocs envoyés aux processus, et nombre minimal
+# de descriptions distinctes à extraire en dessous duquel le démarrage des
+# processus coûte plus cher que l'extraction en série
+DEFAULT_CHUNK_SIZE = 20_000
+PARALLEL_MIN_ROWS = 50_000
+
+# Avec un pool déjà démarré (lecture en flux, voir utils.excel_io), le
+# démarrage n'est plus à payer : les descriptions distinctes d'un lot sont
+# réparties entre les processus dès qu'il y en a au moins ce nombre par processus
+PARALLEL_MIN_CHUNK = 2_000
+
+# Les pools de processus sont souvent créés depuis un thread du serveur
+# Streamlit : un fork d'un processus multithreadé peut copier un verrou
+# tenu et bloquer l'enfant. Démarrage par forkserver (spawn si indisponible).
+PROCESS_START_METHOD = ('forkserver' if 'forkserver' in multiprocessing.get_all_start_methods()
+                        else 'spawn')
+
+# Extracteurs scalaires des colonnes à une valeur (nom de l'étape mesurée =
+# nom de l'extracteur) ; la clarté et les dimensions sont traitées à part
+_SCALAR_EXTRACTORS = {
+    'Shape': ('extract_shape', extract_shape),
+    'Color': ('extract_color', extract_color),
+    'Certi Number': ('extract_gia_number', extract_gia_number),
+    'PCS/Carat': ('extract_pcs_carat', extract_pcs_carat),
+}
+
+
+def process_pool(workers):
+    """ProcessPoolExecutor démarré avec PROCESS_START_METHOD plutôt que fork."""
+    return ProcessPoolExecutor(max_workers=workers,
+                               mp_context=multiprocessing.get_context(PROCESS_START_METHOD))
+
+def _found_counts(name, values):
+    """Compteurs trouvé / non trouvé d'une colonne, pour le panneau de diagnostic."""
+    missing = sum(1 for value in values if value is None or value == MISSING_VALUES.get(name))
+    return {'found': len(values) - missing, 'none': missing}
+
+def _clarity_column(values):
+    """
+    Clarté : extracting_clarity sur chaque description. L'étape de la
+    cascade n'est relevée que si un profiler est actif.
+    """
+    if active_profiler() is None:
+        return [extracting_clarity(value) for value in values]
+    scanned = [scan_clarity_stage(value.upper().strip()) if value and isinstance(value, str)
+               else (None, None) for value in values]
+    count_branches('extracting_clarity', Counter(
+        f'stage_{found_stage:02d}' if found_stage is not None else 'none'
+        for _, found_stage in scanned
+    ))
+    return [code for code, _ in scanned]
+
+def _scalar_column(name, values):
+    """Colonne `name` : son extracteur scalaire appliqué à chaque description."""
+    label, extractor = _SCALAR_EXTRACTORS[name]
+    with stage(label, rows=len(values)):
+        column = [extractor(value) for value in values]
+    if active_profiler() is not None:
+        count_branches(label, _found_counts(name, column))
+    return column
+
+def _extract_chunk(values):
+    """
+    Applique les extracteurs scalaires à un tableau de descriptions (une
+    étape mesurée par extracteur). Retourne un dictionnaire colonne -> tableau.
+    Fonction de niveau module pour pouvoir être exécutée dans un processus.
+    """
+    n = len(values)
+    columns = {'Shape': _scalar_column('Shape', values)}
+    with stage('extracting_clarity', rows=n):
+        columns['Clarity'] = _clarity_column(values)
+    columns['Color'] = _scalar_column('Color', values)
+    columns['Certi Number'] = _scalar_column('Certi Number', values)
+    with stage('extract_dimensions', rows=n):
+        dimensions = np.array([scan_dimensions(value) for value in values],
+                              dtype=object).reshape(n, len(DIMENSION_COLUMNS))
+    if active_profiler() is not None:
+        count_branches('extract_dimensions', _found_counts('Length', dimensions[:, 0]))
+    for i, name in enumerate(DIMENSION_COLUMNS):
+        columns[name] = dimensions[:, i]
+    columns['PCS/Carat'] = _scalar_column('PCS/Carat', values)
+    return {name: np.asarray(columns[name], dtype=object) for name in EXTRACTED_COLUMNS}
+
+def _extract_chunk_profiled(descriptions):
+    """
+    _extract_chunk avec un profiler local au processus ; retourne aussi
+    ses mesures pour les cumuler dans le processus principal.
+    """
+    with profiling() as profiler:
+        columns = _extract_chunk(descriptions)
+    return columns, profiler.to_dict()
+
+def _map_chunks(executor, chunks):
+    profiler = active_profiler()
+    if profiler is None:
+        return list(executor.map(_extract_chunk, chunks))
+    parts = []
+    for columns, profile in executor.map(_extract_chunk_profiled, chunks):
+        profiler.merge(profile)
+        parts.append(columns)
+    return parts
+
+def _extract_parallel(descriptions, workers, chunk_size, executor=None):
+    """
+    Découpe les descriptions en blocs de `chunk_size` et les extrait dans un
+    ProcessPoolExecutor (`executor` s'il est fourni, sinon un pool créé pour
+    l'appel). executor.map conserve l'ordre des blocs : le résultat est
+    identique à _extract_chunk sur le tableau complet.
+    Si un profiler est actif, les mesures des processus y sont ajoutées
+    (durées cumulées sur l'ensemble des processus).
+    """
+    chunks = [descriptions[start:start + chunk_size]
+              for start in range(0, len(descriptions), chunk_size)]
+    if executor is not None:
+        parts = _map_chunks(executor, chunks)
+    else:
+        with process_pool(min(workers, len(chunks))) as executor:
+            parts = _map_chunks(executor, chunks)
+    return {
+        name: np.concatenate([np.asarray(part[name], dtype=object) for part in parts])
+        for name in EXTRACTED_COLUMNS
+    }
+
+def extract_columns(descriptions, cache=None, workers=1, chunk_size=DEFAULT_CHUNK_SIZE,
+                    executor=None):
+    """
+    Extrait toutes les colonnes dérivées d'une série de descriptions.
+    Retourne un DataFrame (colonnes EXTRACTED_COLUMNS) indexé comme la série,
+    identique au résultat des extracteurs appliqués ligne par ligne.
+
+    Les descriptions sont dédoublonnées (pd.factorize) : les extracteurs ne
+    tournent que sur les chaînes distinctes, puis les résultats sont
+    redistribués sur les lignes. `cache` (utils.cache.DescriptionCache,
+    optionnel) évite de réextraire les descriptions déjà vues lors d'un
+    import précédent. Les statistiques sont dans attrs['extraction_stats'].
+
+    Avec `workers` > 1 (None : nombre de cœurs), les descriptions distinctes
+    sont extraites par blocs de `chunk_size` dans plusieurs processus, à
+    partir de PARALLEL_MIN_ROWS descriptions ; sinon l'extraction reste en
+    série. Avec un ProcessPoolExecutor déjà démarré (`executor`, partagé
+    entre les lots d'une lecture en flux), le seuil est de
+    PARALLEL_MIN_CHUNK descriptions par processus et les blocs sont
+    dimensionnés pour occuper les `workers` processus. Le résultat ne
+    dépend pas du nombre de processus.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    values = descriptions.to_numpy(dtype=object)
+    n = len(values)
+    is_str = np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=n)
+    str_rows = np.flatnonzero(is_str)
+    other_rows = np.flatnonzero(~is_str)
+
+    # Dédoublonnage : codes[i] = position de la description dans `uniques`
+    codes, uniques = pd.factorize(values[str_rows])
+    uniques = np.asarray(uniques, dtype=object)
+
+    unique_columns = {name: np.empty(len(uniques), dtype=object) for name in EXTRACTED_COLUMNS}
+    cached = cache.get_many(uniques) if cache is not None else {}
+    for position, description in enumerate(uniques):
+        hit = cached.get(description)
+        if hit is not None:
+            for name, value in zip(EXTRACTED_COLUMNS, hit):
+                unique_columns[name][position] = value
+    to_extract = np.array([d not in cached for d in uniques], dtype=bool)
+
+    if to_extract.any():
+        pending = uniques[to_extract]
+        if workers > 1 and executor is not None and len(pending) >= 2 * PARALLEL_MIN_CHUNK:
+            size = min(chunk_size, max(PARALLEL_MIN_CHUNK, -(-len(pending) // workers)))
+            extracted = _extract_parallel(pending, workers, size, executor)
+        elif workers > 1 and len(pending) >= PARALLEL_MIN_ROWS:
+            extracted = _extract_parallel(pending, workers, chunk_size)
+        else:
+            extracted = _extract_chunk(pending)
+        for name in EXTRACTED_COLUMNS:
+            unique_columns[name][to_extract] = extracted[name]
+        if cache is not None:
+            cache.put_many(zip(
+                uniques[to_extract],
+                zip(*(extracted[name] for name in EXTRACTED_COLUMNS)),
+            ))
+
+    columns = {name: np.empty(n, dtype=object) for name in EXTRACTED_COLUMNS}
+    for name in EXTRACTED_COLUMNS:
+        columns[name][str_rows] = unique_columns[name][codes]
+
+    # Valeurs non textuelles (NaN, nombres...) : non dédoublonnées
+    if len(other_rows):
+        others = _extract_chunk(values[other_rows])
+        for name in EXTRACTED_COLUMNS:
+            columns[name][other_rows] = others[name]
+
+    result = pd.DataFrame({
+        name: pd.Series(columns[name], index=descriptions.index, dtype=object).infer_objects()
+        for name in EXTRACTED_COLUMNS
+    })
+    result.attrs['extraction_stats'] = _extraction_stats(
+        n, len(str_rows), len(uniques), len(cached), int(to_extract.sum()))
+    return result
+
+def _extraction_stats(rows, text_rows, unique_descriptions, cache_hits, extracted):
+    """
+    Résumé du dédoublonnage et du cache pour une extraction.
+    dedup_hit_rate : part des lignes texte servies sans nouvelle extraction
+    grâce au dédoublonnage ; cache_hit_rate : part des descriptions distinctes
+    trouvées dans le cache.
+    """
+    return {
+        'rows': rows,
+        'text_rows': text_rows,
+        'unique_descriptions': unique_descriptions,
+        'cache_hits': cache_hits,
+        'extracted': extracted,
+        'dedup_hit_rate': 1 - unique_descriptions / text_rows if text_rows else 0.0,
+        'cache_hit_rate': cache_hits / unique_descriptions if unique_descriptions else 0.0,
+    }
+
+def merge_extraction_stats(stats_list):
+    """
+    Cumule les statistiques de plusieurs extractions (lots d'un même fichier).
+    Les descriptions distinctes sont comptées par lot.
+    """
+    totals = {key: sum(stats[key] for stats in stats_list)
+              for key in ('rows', 'text_rows', 'unique_descriptions', 'cache_hits', 'extracted')}
+    return _extraction_stats(totals['rows'], totals['text_rows'], totals['unique_descriptions'],
+                             totals['cache_hits'], totals['extracted'])